@@ -9,6 +9,7 @@ export const dynamic = 'force-dynamic';
 // Cache for expensive search operations
 const searchCache = new Map<string, { results: NaturalLanguageSearchResult[]; timestamp: number }>();
 const CACHE_TTL = 5 * 60 * 1000; // 5 minutes
+const LOCAL_VECTOR_TIMEOUT = 2000; // Give up on the local index and fall back after 2s
 
 /**
  * Normalize and validate query
@@ -110,6 +111,44 @@ function fallbackKeywordSearch(
     .slice(0, limit);
 }
 
+/**
+ * Similarity search against the local vector index service
+ * (python -m scripts.vectors serve), used instead of Claude when
+ * LOCAL_VECTOR_INDEX_URL is set so search works offline
+ */
+async function localVectorSearch(
+  query: string,
+  books: Book[],
+  limit: number = 10
+): Promise<NaturalLanguageSearchResult[]> {
+  const response = await fetch(`${process.env.LOCAL_VECTOR_INDEX_URL}/match_books`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    // Over-fetch so read books can be filtered out and still fill the limit
+    body: JSON.stringify({ query, match_count: limit * 3 }),
+    // A hung local service must not hold the request; the timeout error
+    // lands in the keyword fallback like any other failure
+    signal: AbortSignal.timeout(LOCAL_VECTOR_TIMEOUT)
+  });
+
+  if (!response.ok) {
+    throw new Error(`Local vector index returned ${response.status}`);
+  }
+
+  const { matches } = (await response.json()) as { matches: { id: string; similarity: number }[] };
+  const booksById = new Map(books.map(book => [book.id, book]));
+
+  return matches
+    .filter(match => booksById.has(match.id))
+    .slice(0, limit)
+    .map(match => ({
+      book: booksById.get(match.id)!,
+      matchScore: Math.round(match.similarity * 100),
+      matchReasons: ['Similar to your search (local vector index)'],
+      relevanceToQuery: Math.round(match.similarity * 100)
+    }));
+}
+
 /**
  * Retry wrapper with exponential backoff
  */
@@ -214,19 +253,23 @@ export async function POST(request: NextRequest) {
     const movieReferences = extractMovieReferences(normalized);
 
     try {
-      // Call Claude to find matches with retry logic
-      results = await withRetry(
-        () => findMatchingBooks(normalized, userProfile, unreadBooks, 10),
-        3,
-        1000
-      );
+      if (process.env.LOCAL_VECTOR_INDEX_URL) {
+        results = await localVectorSearch(normalized, unreadBooks, 10);
+      } else {
+        // Call Claude to find matches with retry logic
+        results = await withRetry(
+          () => findMatchingBooks(normalized, userProfile, unreadBooks, 10),
+          3,
+          1000
+        );
+      }
 
       // Validate results
       if (!results || results.length === 0) {
-        throw new Error('No results returned from Claude');
+        throw new Error('No results returned from search');
       }
     } catch (error) {
-      console.error('Claude search failed, using fallback:', error);
+      console.error('Search failed, using fallback:', error);
       
       // Use keyword-based fallback
       results = fallbackKeywordSearch(normalized, unreadBooks, 10);
@@ -6,8 +6,17 @@
  * Rate limit: 100 requests per 5 minutes per IP
  */
 
+import coverPlaceholders from '../data/coverPlaceholders.json';
+
 export type CoverSize = 'S' | 'M' | 'L';
 
+export interface CoverPlaceholder {
+  color: string;
+  blurhash: string;
+  width: number;
+  height: number;
+}
+
 /**
  * Get Open Library cover URL for an ISBN
  * @param isbn - Book ISBN
@@ -75,3 +84,23 @@ export function getGradientFallback(): string {
   return gradients[Math.floor(Math.random() * gradients.length)] || gradients[0]!;
 }
 
+/**
+ * Get a precomputed placeholder for a cover served from public/
+ * Generated by `npm run images:index` (scripts/assets/asset_index.py)
+ * @param src - Public URL of the image, e.g. "/demo book covers/babel.jpg"
+ * @returns Dominant color, BlurHash and intrinsic size, or undefined if not indexed
+ */
+export function getCoverPlaceholder(src: string): CoverPlaceholder | undefined {
+  const placeholders = coverPlaceholders as Record<string, CoverPlaceholder>;
+  const placeholder = placeholders[src];
+  if (placeholder) {
+    return placeholder;
+  }
+
+  try {
+    return placeholders[decodeURI(src)];
+  } catch {
+    // Malformed escape (e.g. a stray %): the raw lookup was the only option
+    return undefined;
+  }
+}
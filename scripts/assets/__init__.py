@@ -0,0 +1,7 @@
+"""Stacks asset generators (app icons and related image assets)
+
+Run from the repository root with:
+
+    python -m scripts.assets icons --jobs 4
+    python -m scripts.assets watch          # live previews of icon-design.json
+"""
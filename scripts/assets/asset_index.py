@@ -0,0 +1,289 @@
+"""Duplicate detection and placeholder index for the images in public/
+
+For every image this records an exact content hash, a 64-bit perceptual
+difference hash (dHash), its dominant colors and a BlurHash string. Exact
+and near duplicates are reported, and two files are written: the full
+audit index with hashes and duplicate groups (.asset-index.json, never
+bundled), and a slim placeholder map (lib/data/coverPlaceholders.json) of
+color, BlurHash and size per URL that the cover components import to paint
+a placeholder before the real image arrives.
+
+Decoding dominates, so JPEGs are decoded with DCT scaling straight down to
+thumbnail size, files are spread across a process pool, and all per-image
+math runs vectorized over a small thumbnail.
+"""
+
+import os
+import json
+import hashlib
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from .icons import REPO_ROOT
+from .responsive import PUBLIC_DIR, RESPONSIVE_DIR, SOURCE_EXTENSIONS, public_url
+
+INDEX_PATH = os.path.join(REPO_ROOT, ".asset-index.json")
+PLACEHOLDERS_PATH = os.path.join(REPO_ROOT, "lib", "data", "coverPlaceholders.json")
+INDEX_VERSION = 1
+
+# Placeholder color when k-means found none
+DEFAULT_PLACEHOLDER_COLOR = "#e5e7eb"
+
+# Edge length of the thumbnail used for colors and BlurHash
+THUMBNAIL_SIZE = 32
+
+DOMINANT_COLORS = 3
+KMEANS_ITERATIONS = 8
+
+# dHash Hamming distance at or below which two images count as near duplicates
+NEAR_DUPLICATE_DISTANCE = 6
+
+BASE83_CHARS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~"
+
+@dataclass
+class AssetRecord:
+    """Everything the index stores about one image"""
+    
+    url: str
+    sha256: str
+    bytes: int
+    width: int
+    height: int
+    dhash: int
+    colors: list
+    blurhash: str
+
+def find_images(source_dirs=(PUBLIC_DIR,)):
+    """All images under the given directories, skipping generated variants"""
+    
+    paths = []
+    for dir_path in source_dirs:
+        for root, dirs, files in os.walk(dir_path):
+            dirs[:] = sorted(d for d in dirs if os.path.join(root, d) != RESPONSIVE_DIR)
+            paths.extend(
+                os.path.join(root, filename) for filename in sorted(files)
+                if filename.lower().endswith(SOURCE_EXTENSIONS)
+            )
+    return paths
+
+def load_thumbnail(img, size=THUMBNAIL_SIZE):
+    """Decode an image straight to a small opaque RGB thumbnail
+    
+    draft() lets the JPEG decoder scale by up to 1/8 during decoding, which
+    is far cheaper than decoding at full size and resizing.
+    """
+    
+    img.draft("RGB", (size * 2, size * 2))
+    if img.mode in ("RGBA", "LA", "PA", "P"):
+        img = img.convert("RGBA")
+        background = Image.new("RGBA", img.size, (255, 255, 255, 255))
+        img = Image.alpha_composite(background, img)
+    return img.convert("RGB").resize((size, size), Image.BOX)
+
+def difference_hash(thumbnail):
+    """64-bit dHash: is each pixel brighter than its right neighbour (9x8 gray)"""
+    
+    gray = np.asarray(thumbnail.convert("L").resize((9, 8), Image.BOX), dtype=np.int16)
+    bits = (gray[:, :-1] > gray[:, 1:]).ravel()
+    return int(np.packbits(bits).view(">u8")[0])
+
+def dominant_colors(pixels, count=DOMINANT_COLORS, iterations=KMEANS_ITERATIONS):
+    """K-means over thumbnail pixels; returns [(hex color, share)] by share
+    
+    Centers start at luminance quantiles so results are deterministic.
+    """
+    
+    pixels = pixels.reshape(-1, 3).astype(np.float32)
+    luminance = pixels @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    order = np.argsort(luminance, kind="stable")
+    centers = pixels[order[((np.arange(count) + 0.5) * len(order) / count).astype(int)]]
+    
+    for _ in range(iterations):
+        distances = ((pixels[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+        labels = distances.argmin(axis=1)
+        counts = np.bincount(labels, minlength=count)
+        sums = np.zeros_like(centers)
+        np.add.at(sums, labels, pixels)
+        nonempty = counts > 0
+        centers[nonempty] = sums[nonempty] / counts[nonempty, None]
+    
+    shares = counts / counts.sum()
+    ranked = np.argsort(-shares, kind="stable")
+    return [
+        ("#%02x%02x%02x" % tuple(int(round(c)) for c in centers[i]), round(float(shares[i]), 3))
+        for i in ranked if counts[i]
+    ]
+
+def _base83(value, length):
+    return "".join(BASE83_CHARS[(value // 83 ** (length - i - 1)) % 83] for i in range(length))
+
+def _srgb_to_linear(values):
+    values = values / 255.0
+    return np.where(values <= 0.04045, values / 12.92, ((values + 0.055) / 1.055) ** 2.4)
+
+def _linear_to_srgb(value):
+    value = min(max(value, 0.0), 1.0)
+    if value <= 0.0031308:
+        return int(value * 12.92 * 255 + 0.5)
+    return int((1.055 * value ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+def blurhash(pixels, x_components=4, y_components=3):
+    """Encode an (h, w, 3) uint8 array as a BlurHash string
+    
+    The DCT factors for all components are a single einsum over the
+    linearized pixels rather than a per-pixel loop.
+    """
+    
+    height, width = pixels.shape[:2]
+    linear = _srgb_to_linear(pixels.astype(np.float64))
+    
+    basis_x = np.cos(np.pi * np.arange(x_components)[:, None] * np.arange(width)[None, :] / width)
+    basis_y = np.cos(np.pi * np.arange(y_components)[:, None] * np.arange(height)[None, :] / height)
+    factors = np.einsum("jy,ix,yxc->jic", basis_y, basis_x, linear) / (width * height)
+    factors[1:, :, :] *= 2
+    factors[0, 1:, :] *= 2
+    factors = factors.reshape(-1, 3)
+    
+    dc, ac = factors[0], factors[1:]
+    result = _base83((x_components - 1) + (y_components - 1) * 9, 1)
+    
+    if len(ac):
+        quantised_max = int(max(0, min(82, np.floor(np.abs(ac).max() * 166 - 0.5))))
+        max_value = (quantised_max + 1) / 166
+        result += _base83(quantised_max, 1)
+    else:
+        max_value = 1
+        result += _base83(0, 1)
+    
+    r, g, b = (_linear_to_srgb(channel) for channel in dc)
+    result += _base83((r << 16) + (g << 8) + b, 4)
+    
+    quantised = np.clip(np.floor(np.sign(ac) * np.abs(ac / max_value) ** 0.5 * 9 + 9.5), 0, 18).astype(int)
+    for qr, qg, qb in quantised:
+        result += _base83(qr * 19 * 19 + qg * 19 + qb, 2)
+    
+    return result
+
+def index_image(path):
+    """Hash, fingerprint and summarize one image (runs in a worker process)"""
+    
+    with open(path, "rb") as f:
+        data = f.read()
+    
+    with Image.open(path) as img:
+        width, height = img.size
+        thumbnail = load_thumbnail(img)
+    
+    pixels = np.asarray(thumbnail)
+    x_components, y_components = (3, 4) if height > width else (4, 3)
+    
+    return AssetRecord(
+        url=public_url(path),
+        sha256=hashlib.sha256(data).hexdigest(),
+        bytes=len(data),
+        width=width,
+        height=height,
+        dhash=difference_hash(thumbnail),
+        colors=dominant_colors(pixels),
+        blurhash=blurhash(pixels, x_components, y_components)
+    )
+
+def try_index_image(path):
+    """index_image, returning the error text instead of raising (worker side)"""
+    
+    try:
+        return index_image(path)
+    except Exception as e:
+        return repr(e)
+
+def hamming_distances(hashes, block=1024):
+    """Yield (row offset, block x N distance matrix) for 64-bit hashes"""
+    
+    hashes = np.asarray(hashes, dtype=np.uint64)
+    for start in range(0, len(hashes), block):
+        xor = hashes[start:start + block, None] ^ hashes[None, :]
+        if hasattr(np, "bitwise_count"):
+            yield start, np.bitwise_count(xor)
+        else:
+            yield start, np.unpackbits(xor.view(np.uint8), axis=-1).reshape(*xor.shape, 64).sum(axis=-1)
+
+def find_duplicates(records, max_distance=NEAR_DUPLICATE_DISTANCE):
+    """Group exact duplicates by sha256 and pair up perceptual near duplicates
+    
+    Returns (exact groups of urls, [(url, url, distance)]); pairs that are
+    already exact duplicates are not repeated as near duplicates.
+    """
+    
+    by_digest = {}
+    for record in records:
+        by_digest.setdefault(record.sha256, []).append(record.url)
+    exact = [sorted(urls) for urls in by_digest.values() if len(urls) > 1]
+    
+    near = []
+    for start, distances in hamming_distances([record.dhash for record in records]):
+        rows, cols = np.nonzero(distances <= max_distance)
+        for row, col in zip(rows + start, cols):
+            if row < col and records[row].sha256 != records[col].sha256:
+                near.append((records[row].url, records[col].url, int(distances[row - start, col])))
+    
+    return sorted(exact), sorted(near)
+
+def write_compact_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f, separators=(",", ":"), sort_keys=True)
+        f.write("\n")
+
+def build_asset_index(source_dirs=(PUBLIC_DIR,), output_path=INDEX_PATH, jobs=None,
+                      max_distance=NEAR_DUPLICATE_DISTANCE, placeholders_path=PLACEHOLDERS_PATH):
+    """Index every image and write the audit index and the placeholder map
+    
+    Returns (records, exact, near, failures), where failures are (url, error)
+    pairs for images that could not be read; they are left out of the index.
+    """
+    
+    paths = find_images(source_dirs)
+    chunksize = max(1, len(paths) // ((jobs or os.cpu_count() or 1) * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        outcomes = list(pool.map(try_index_image, paths, chunksize=chunksize))
+    
+    records = [outcome for outcome in outcomes if isinstance(outcome, AssetRecord)]
+    failures = [(public_url(path), outcome) for path, outcome in zip(paths, outcomes) if isinstance(outcome, str)]
+    
+    exact, near = find_duplicates(records, max_distance)
+    
+    index = {
+        "version": INDEX_VERSION,
+        "assets": {
+            record.url: {
+                "sha256": record.sha256,
+                "bytes": record.bytes,
+                "width": record.width,
+                "height": record.height,
+                "dhash": f"{record.dhash:016x}",
+                "colors": record.colors,
+                "blurhash": record.blurhash
+            }
+            for record in records
+        },
+        "duplicates": exact,
+        "nearDuplicates": near
+    }
+    
+    placeholders = {
+        record.url: {
+            "color": record.colors[0][0] if record.colors else DEFAULT_PLACEHOLDER_COLOR,
+            "blurhash": record.blurhash,
+            "width": record.width,
+            "height": record.height
+        }
+        for record in records
+    }
+    
+    write_compact_json(output_path, index)
+    write_compact_json(placeholders_path, placeholders)
+    
+    return records, exact, near, failures
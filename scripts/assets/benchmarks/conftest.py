@@ -0,0 +1,184 @@
+"""Benchmark fixtures: timing, tracemalloc peaks and the JSON baselines
+
+Every benchmark records metrics under a name, and a test fails when a
+metric is worse than its baseline by more than its tolerance. Encoded byte
+sizes are the same on every machine, so they are always checked against
+the committed baseline.json. Wall times and memory peaks are not: they go
+to a git-ignored baseline.local.json and are only compared when
+--compare-timings is passed, against a baseline recorded on the same
+machine. Run with --update-baseline to rewrite the recorded entries in
+both files instead, and --update-golden to re-render the golden icons
+after an intended visual change.
+"""
+
+import os
+import sys
+import json
+import time
+import tracemalloc
+
+import pytest
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(BENCHMARK_DIR, "baseline.json")
+LOCAL_BASELINE_PATH = os.path.join(BENCHMARK_DIR, "baseline.local.json")
+
+# Allowed growth per metric over the baseline: (relative, absolute)
+TOLERANCES = {
+    "seconds": (0.5, 0.002),
+    "peak_bytes": (0.2, 64 * 1024),
+    "bytes": (0.02, 16)
+}
+
+# Metrics that depend on the machine and live in the local baseline
+MACHINE_METRICS = ("seconds", "peak_bytes")
+
+# Make `scripts.assets` importable however pytest was started
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(BENCHMARK_DIR)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+def pytest_addoption(parser):
+    group = parser.getgroup("asset benchmarks")
+    group.addoption(
+        "--update-baseline",
+        action="store_true",
+        help="rewrite baseline.json with this run's metrics instead of comparing"
+    )
+    group.addoption(
+        "--update-golden",
+        action="store_true",
+        help="re-render the golden icons instead of diffing against them"
+    )
+    group.addoption(
+        "--compare-timings",
+        action="store_true",
+        help="also fail on time and memory regressions against baseline.local.json"
+    )
+    group.addoption(
+        "--benchmark-repeat",
+        type=int,
+        default=3,
+        help="timed runs per benchmark; the fastest counts (default: 3)"
+    )
+
+def load_baseline(path=BASELINE_PATH):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def split_metrics(results):
+    """({name: portable metrics}, {name: machine metrics}) without empty entries"""
+    
+    portable, machine = {}, {}
+    for name, metrics in results.items():
+        for metric, value in metrics.items():
+            target = machine if metric in MACHINE_METRICS else portable
+            target.setdefault(name, {})[metric] = value
+    return portable, machine
+
+def save_baseline(path, entries):
+    # Merge so a run filtered with -k keeps the other entries
+    baseline = load_baseline(path)
+    baseline.update(entries)
+    with open(path, "w") as f:
+        json.dump(dict(sorted(baseline.items())), f, indent=2)
+        f.write("\n")
+
+def regressions(name, metrics, baseline):
+    """Messages for every metric worse than its baseline beyond tolerance"""
+    
+    messages = []
+    for metric, value in metrics.items():
+        expected = baseline.get(name, {}).get(metric)
+        if expected is None:
+            continue
+        relative, absolute = TOLERANCES[metric]
+        limit = expected * (1 + relative) + absolute
+        if value > limit:
+            messages.append(f"{name} {metric}: {value:g} > {limit:g} (baseline {expected:g})")
+    return messages
+
+def measure(fn, repeat=3):
+    """Run fn repeat times for the best wall time, then once under tracemalloc
+    
+    tracemalloc sees Python and NumPy allocations but not Pillow's C-level
+    buffers, so peak_bytes tracks the NumPy encode and pyramid work.
+    Returns (result, seconds, peak_bytes).
+    """
+    
+    seconds = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        seconds = min(seconds, time.perf_counter() - start)
+    
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    
+    return result, seconds, peak
+
+class BenchmarkRecorder:
+    """Collects this run's metrics and checks them against the baseline"""
+    
+    def __init__(self, baseline, repeat, update, local_baseline=None):
+        self.baseline = baseline
+        self.local_baseline = local_baseline
+        self.repeat = repeat
+        self.update = update
+        self.results = {}
+    
+    def measure(self, fn):
+        return measure(fn, self.repeat)
+    
+    def record(self, name, **metrics):
+        self.record_all({name: metrics})
+    
+    def record_all(self, entries):
+        """Record {name: metrics} and fail on any regression among them"""
+        
+        for name, metrics in entries.items():
+            self.results[name] = {metric: round(value, 6) for metric, value in metrics.items()}
+        if self.update:
+            return
+        
+        portable, machine = split_metrics(entries)
+        missing = [name for name in portable if name not in self.baseline]
+        if self.local_baseline is not None:
+            missing += [name for name in machine if name not in self.local_baseline]
+        if missing:
+            pytest.skip(f"No baseline for {', '.join(sorted(set(missing)))}; run with --update-baseline")
+        
+        failures = [message for name, metrics in portable.items() for message in regressions(name, metrics, self.baseline)]
+        if self.local_baseline is not None:
+            failures += [
+                message for name, metrics in machine.items()
+                for message in regressions(name, metrics, self.local_baseline)
+            ]
+        assert not failures, "Regressed past tolerance:\n" + "\n".join(failures)
+
+@pytest.fixture(scope="session")
+def asset_benchmark(request):
+    config = request.config
+    recorder = BenchmarkRecorder(
+        load_baseline(),
+        config.getoption("--benchmark-repeat"),
+        config.getoption("--update-baseline"),
+        load_baseline(LOCAL_BASELINE_PATH) if config.getoption("--compare-timings") else None
+    )
+    yield recorder
+    
+    if recorder.update and recorder.results:
+        portable, machine = split_metrics(recorder.results)
+        save_baseline(BASELINE_PATH, portable)
+        save_baseline(LOCAL_BASELINE_PATH, machine)
+
+@pytest.fixture(scope="session")
+def update_golden(request):
+    return request.config.getoption("--update-golden")
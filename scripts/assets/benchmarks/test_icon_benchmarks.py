@@ -0,0 +1,97 @@
+"""Time, memory and size benchmarks for the icon generator, plus golden diffs
+
+Run from the repository root with:
+    
+    python -m pytest scripts/assets/benchmarks -q
+"""
+
+import io
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from scripts.assets import icons
+from scripts.assets.encode import encode_png_smallest
+from scripts.assets.icons import (
+    ICON_TARGETS, build_icon_pyramid, create_all_ios_icons, create_book_stack_icon,
+    load_icon_specs, render_icon_png, render_master_icon
+)
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden")
+
+SPEC_SIZES = sorted({size for size, _ in load_icon_specs(ICON_TARGETS[0])})
+
+# A golden pixel may drift by this many levels per channel...
+GOLDEN_CHANNEL_TOLERANCE = 2
+# ...and at most this fraction of pixels may drift at all
+GOLDEN_CHANGED_FRACTION = 0.001
+
+@pytest.fixture(scope="module")
+def pyramid():
+    return build_icon_pyramid(render_master_icon(), SPEC_SIZES)
+
+@pytest.mark.parametrize("size", SPEC_SIZES)
+def test_create_book_stack_icon(size, asset_benchmark):
+    _, seconds, peak = asset_benchmark.measure(lambda: create_book_stack_icon(size))
+    asset_benchmark.record(f"create_book_stack_icon/{size}", seconds=seconds, peak_bytes=peak)
+
+@pytest.mark.parametrize("size", SPEC_SIZES)
+def test_encode_png_smallest(size, pyramid, asset_benchmark):
+    encoded, seconds, peak = asset_benchmark.measure(lambda: encode_png_smallest(pyramid[size]))
+    asset_benchmark.record(f"encode_png_smallest/{size}", seconds=seconds, peak_bytes=peak, bytes=encoded.bytes)
+
+def test_create_all_ios_icons(tmp_path, asset_benchmark):
+    output_dir = str(tmp_path / "AppIcon.appiconset")
+    
+    def build():
+        # Start cold each run: no cached master render, every icon rebuilt
+        icons._master_cache.clear()
+        return create_all_ios_icons([output_dir], force=True, jobs=1, contents_template=ICON_TARGETS[0])
+    
+    results, seconds, peak = asset_benchmark.measure(build)
+    failed = [result.path for result in results if result.status == "failed"]
+    assert not failed, f"Icons failed to build: {failed}"
+    
+    entries = {
+        "create_all_ios_icons": {
+            "seconds": seconds,
+            "peak_bytes": peak,
+            "bytes": sum(result.bytes for result in results)
+        }
+    }
+    for result in results:
+        entries[f"create_all_ios_icons/{os.path.basename(result.path)}"] = {"bytes": result.bytes}
+    asset_benchmark.record_all(entries)
+
+@pytest.mark.parametrize("size", SPEC_SIZES)
+def test_golden_icon(size, update_golden, tmp_path):
+    data, _ = render_icon_png(size)
+    golden_path = os.path.join(GOLDEN_DIR, f"icon-{size}.png")
+    
+    if update_golden:
+        os.makedirs(GOLDEN_DIR, exist_ok=True)
+        with open(golden_path, "wb") as f:
+            f.write(data)
+        return
+    
+    if not os.path.exists(golden_path):
+        pytest.skip(f"No golden icon for {size}px; run with --update-golden")
+    
+    actual = np.asarray(Image.open(io.BytesIO(data)).convert("RGBA"), dtype=np.int16)
+    with Image.open(golden_path) as img:
+        expected = np.asarray(img.convert("RGBA"), dtype=np.int16)
+    
+    assert actual.shape == expected.shape, f"{size}px icon is {actual.shape}, golden is {expected.shape}"
+    
+    diff = np.abs(actual - expected).max(axis=2)
+    changed = float((diff > GOLDEN_CHANNEL_TOLERANCE).mean())
+    if changed > GOLDEN_CHANGED_FRACTION:
+        # Save the render for a side-by-side look with the golden icon
+        actual_path = tmp_path / f"icon-{size}.png"
+        actual_path.write_bytes(data)
+        pytest.fail(
+            f"{size}px icon drifted from {golden_path}: {changed:.2%} of pixels differ by more than "
+            f"{GOLDEN_CHANNEL_TOLERANCE} levels (max {int(diff.max())}); render saved to {actual_path}"
+        )
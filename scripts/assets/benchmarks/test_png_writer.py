@@ -0,0 +1,148 @@
+"""Decode-equality round trips for the PNG writer in png.py
+
+Every image written by write_png and PngStreamWriter must decode (with
+Pillow) to exactly the pixels it was given, whatever the mode, bit depth,
+row filter or strip split.
+"""
+
+import io
+import struct
+import zlib
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from scripts.assets.encode import optimize_png_file
+from scripts.assets.png import (
+    FILTER_NONE, FILTER_SUB, FILTER_UP, FILTER_AVERAGE, FILTER_PAETH, FILTER_ADAPTIVE,
+    PngStreamWriter, png_chunk, read_chunks, write_png
+)
+
+FILTER_TYPES = [FILTER_NONE, FILTER_SUB, FILTER_UP, FILTER_AVERAGE, FILTER_PAETH, FILTER_ADAPTIVE]
+
+# Odd sizes so sub-byte rows need padding and filters see ragged edges
+WIDTH, HEIGHT = 37, 23
+
+def random_image(mode, bit_depth=8, seed=0):
+    """(pixels, palette) for a random image that fits mode and bit depth"""
+    
+    rng = np.random.default_rng(seed)
+    channels = {"L": 1, "P": 1, "LA": 2, "RGB": 3, "RGBA": 4}[mode]
+    shape = (HEIGHT, WIDTH) if channels == 1 else (HEIGHT, WIDTH, channels)
+    pixels = rng.integers(0, 1 << bit_depth, shape, dtype=np.uint8)
+    palette = rng.integers(0, 256, (1 << bit_depth, 3), dtype=np.uint8) if mode == "P" else None
+    return pixels, palette
+
+def decoded(data, mode, palette=None):
+    """Pixels of PNG bytes as a NumPy array in the writer's layout"""
+    
+    with Image.open(io.BytesIO(data)) as img:
+        img.load()
+        if mode == "P":
+            # Compare palette indices and the palette itself
+            assert np.array_equal(np.asarray(img.getpalette()[:palette.size], dtype=np.uint8), palette.ravel())
+        return np.asarray(img)
+
+def idat_stream(data):
+    """Concatenated IDAT bodies of PNG bytes"""
+    
+    return b"".join(body for chunk_type, body in read_chunks(data) if chunk_type == b"IDAT")
+
+@pytest.mark.parametrize("filter_type", FILTER_TYPES)
+@pytest.mark.parametrize("mode", ["L", "LA", "RGB", "RGBA", "P"])
+def test_write_png_round_trip(mode, filter_type):
+    pixels, palette = random_image(mode)
+    data = write_png(pixels, mode, palette, filter_type=filter_type)
+    assert np.array_equal(decoded(data, mode, palette), pixels)
+
+@pytest.mark.parametrize("filter_type", FILTER_TYPES)
+@pytest.mark.parametrize("bit_depth", [1, 2, 4])
+def test_write_png_packed_palette(bit_depth, filter_type):
+    pixels, palette = random_image("P", bit_depth)
+    data = write_png(pixels, "P", palette, bit_depth=bit_depth, filter_type=filter_type)
+    assert np.array_equal(decoded(data, "P", palette), pixels)
+
+def test_write_png_transparency():
+    pixels, palette = random_image("P", 4)
+    transparency = np.arange(0, 160, 20, dtype=np.uint8)
+    data = write_png(pixels, "P", palette, transparency, bit_depth=4)
+    
+    with Image.open(io.BytesIO(data)) as img:
+        assert img.info["transparency"] == bytes(transparency)
+        assert np.array_equal(np.asarray(img), pixels)
+
+@pytest.mark.parametrize("filter_type", FILTER_TYPES)
+@pytest.mark.parametrize("mode,bit_depth", [("RGB", 8), ("RGBA", 8), ("P", 8), ("P", 2)])
+def test_stream_writer_matches_write_png(mode, bit_depth, filter_type):
+    pixels, palette = random_image(mode, bit_depth)
+    # Uneven strips, including a single row, exercise the carried prev_row
+    splits = [1, 5, 13]
+    
+    buffer = io.BytesIO()
+    with PngStreamWriter(buffer, WIDTH, HEIGHT, mode, palette, bit_depth=bit_depth, filter_type=filter_type) as writer:
+        for strip in np.split(pixels, splits):
+            writer.write_rows(strip)
+    
+    data = buffer.getvalue()
+    assert np.array_equal(decoded(data, mode, palette), pixels)
+    
+    # The same zlib stream in smaller IDAT chunks decodes to the same bytes
+    whole = write_png(pixels, mode, palette, bit_depth=bit_depth, filter_type=filter_type)
+    assert zlib.decompress(idat_stream(data)) == zlib.decompress(idat_stream(whole))
+
+def test_stream_writer_small_idat_chunks(monkeypatch):
+    pixels, _ = random_image("RGBA")
+    monkeypatch.setattr(PngStreamWriter, "IDAT_CHUNK_BYTES", 64)
+    
+    buffer = io.BytesIO()
+    with PngStreamWriter(buffer, WIDTH, HEIGHT, "RGBA") as writer:
+        for strip in np.array_split(pixels, 4):
+            writer.write_rows(strip)
+    
+    data = buffer.getvalue()
+    assert sum(1 for chunk_type, _ in read_chunks(data) if chunk_type == b"IDAT") > 1
+    assert np.array_equal(decoded(data, "RGBA"), pixels)
+
+def test_stream_writer_rejects_short_image():
+    with pytest.raises(ValueError):
+        with PngStreamWriter(io.BytesIO(), WIDTH, HEIGHT, "RGB") as writer:
+            writer.write_rows(random_image("RGB")[0][:-1])
+
+def test_optimize_keeps_color_chunks(tmp_path):
+    pixels, _ = random_image("RGB", 2)
+    path = tmp_path / "colors.png"
+    data = write_png(pixels * 85, "RGB", filter_type=FILTER_NONE, level=0)
+    chunks = png_chunk(b"gAMA", struct.pack(">I", 45455)) + png_chunk(b"sRGB", b"\x00") + png_chunk(b"tEXt", b"Comment\x00x")
+    path.write_bytes(data[:33] + chunks + data[33:])
+    
+    optimize_png_file(str(path))
+    
+    optimized = path.read_bytes()
+    assert [chunk_type for chunk_type, _ in read_chunks(optimized)][1:3] == [b"gAMA", b"sRGB"]
+    assert b"tEXt" not in [chunk_type for chunk_type, _ in read_chunks(optimized)]
+    assert np.array_equal(decoded(optimized, "RGB"), pixels * 85)
+
+def test_optimize_keeps_16_bit_gray(tmp_path):
+    pixels = np.random.default_rng(0).integers(0, 1 << 16, (HEIGHT, WIDTH), dtype=np.uint16)
+    path = tmp_path / "gray16.png"
+    Image.fromarray(pixels).save(path, compress_level=0)
+    
+    optimize_png_file(str(path))
+    
+    with Image.open(path) as img:
+        assert np.array_equal(np.asarray(img), pixels)
+
+def test_optimize_keeps_rgb_color_key(tmp_path):
+    pixels = random_image("RGB", 2)[0] * 85
+    key = tuple(int(value) for value in pixels[0, 0])
+    path = tmp_path / "colorkey.png"
+    Image.fromarray(pixels, "RGB").save(path, transparency=key, compress_level=0)
+    
+    optimize_png_file(str(path))
+    
+    with Image.open(path) as img:
+        rgba = np.asarray(img.convert("RGBA"))
+    transparent = (pixels == key).all(axis=2)
+    assert np.array_equal(rgba[..., :3], pixels)
+    assert (rgba[..., 3] == np.where(transparent, 0, 255)).all()
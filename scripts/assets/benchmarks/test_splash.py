@@ -0,0 +1,16 @@
+"""Splash strips must match a single-pass render of the same image"""
+
+import numpy as np
+import pytest
+
+from scripts.assets.splash import SPLASH_SIZE, SPLASH_VARIANTS, splash_strips
+
+@pytest.mark.parametrize("size", [SPLASH_SIZE, 2048, 777])
+def test_splash_strips_match_single_pass(size):
+    background = SPLASH_VARIANTS[0]["background"]
+    strips = np.concatenate(list(splash_strips(size, background)))
+    single = np.concatenate(list(splash_strips(size, background, strip_pixels=size * size)))
+    
+    assert strips.shape == (size, size, 3)
+    differing = int((strips != single).any(axis=2).sum())
+    assert differing == 0, f"{differing} pixels differ between strips and a single pass at {size}px"
@@ -0,0 +1,15 @@
+"""Byte budgets for encoded assets
+
+Kept free of NumPy and Pillow so build planning and argument parsing can
+use it without importing the encoder.
+"""
+
+# Per-asset byte budget: fixed chunk overhead plus a compressed bytes/pixel
+# allowance (flat-color art like the icons and splash stays far below it)
+BUDGET_BASE_BYTES = 4096
+BUDGET_BYTES_PER_PIXEL = 0.1
+
+def byte_budget(width, height, bytes_per_pixel=BUDGET_BYTES_PER_PIXEL):
+    """Maximum acceptable encoded size for an asset of the given dimensions"""
+    
+    return int(BUDGET_BASE_BYTES + width * height * bytes_per_pixel)
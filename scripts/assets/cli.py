@@ -0,0 +1,447 @@
+"""Command line entry point for the asset generators"""
+
+import os
+import time
+import argparse
+
+def print_results(results):
+    """Print one line per file and return the number of failures"""
+    
+    icons = {"written": "✅", "unchanged": "✨", "failed": "❌"}
+    failures = 0
+    
+    for result in results:
+        path = os.path.relpath(result.path)
+        if result.status == "failed":
+            failures += 1
+            print(f"  {icons[result.status]} {path}: {result.error}")
+        else:
+            print(f"  {icons[result.status]} {path} ({result.size}x{result.size}, {result.bytes} bytes, {result.status})")
+        if result.over_budget:
+            failures += 1
+            print(f"  ⚠️  {path} is {result.bytes} bytes, over its {result.budget} byte budget")
+    
+    return failures
+
+def pillow_missing():
+    """Print install instructions and return True when Pillow is not importable"""
+    
+    import importlib.util
+    
+    if importlib.util.find_spec("PIL") is not None:
+        return False
+    
+    print("❌ Missing required Python library: PIL (Pillow)")
+    print("Install with: pip3 install Pillow")
+    return True
+
+def run_icons(args):
+    from .icons import ICON_DESIGN, ICON_TARGETS, create_all_ios_icons, load_design
+    
+    # Icons render in worker processes, where a missing Pillow would only
+    # show up as one failure per size
+    if pillow_missing():
+        return 1
+    
+    output_dirs = args.out or ICON_TARGETS
+    design = load_design(args.design) if args.design else ICON_DESIGN
+    
+    print("🎨 Creating iOS App Icons for Stacks Library App...")
+    print("")
+    
+    start = time.perf_counter()
+    results = create_all_ios_icons(
+        output_dirs,
+        render_mode=args.render,
+        supersample=args.supersample,
+        force=args.force,
+        jobs=args.jobs,
+        only=args.only,
+        design=design,
+        contents_template=ICON_TARGETS[0],
+        max_error=args.max_error,
+        budget_bpp=args.budget_bpp
+    )
+    elapsed = time.perf_counter() - start
+    
+    failures = print_results(results)
+    written = sum(1 for result in results if result.status == "written")
+    
+    print("")
+    if failures:
+        print(f"❌ {failures} of {len(results)} icons failed or exceeded their budget ({elapsed:.2f}s)")
+        return 1
+    
+    print(f"🎉 {written} written, {len(results) - written} unchanged ({elapsed:.2f}s)")
+    return 0
+
+def run_optimize(args):
+    from concurrent.futures import ProcessPoolExecutor
+    from PIL import Image
+    from .budget import byte_budget
+    from .encode import try_optimize_png_file
+    
+    print("🗜  Optimizing PNG assets...")
+    print("")
+    
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        outcomes = list(pool.map(try_optimize_png_file, args.paths, [args.max_error] * len(args.paths)))
+    
+    failures = 0
+    saved = 0
+    for path, outcome in zip(args.paths, outcomes):
+        if isinstance(outcome, str):
+            failures += 1
+            print(f"  ❌ {path}: {outcome}")
+            continue
+        
+        before, after, method = outcome
+        saved += before - after
+        if method:
+            print(f"  ✅ {path}: {before} → {after} bytes ({method})")
+        else:
+            print(f"  ✨ {path}: {before} bytes, already optimal")
+        
+        with Image.open(path) as img:
+            budget = byte_budget(img.width, img.height, *([args.budget_bpp] if args.budget_bpp is not None else []))
+        if after > budget:
+            failures += 1
+            print(f"  ⚠️  {path} is {after} bytes, over its {budget} byte budget")
+    
+    print("")
+    if failures:
+        print(f"❌ {failures} of {len(outcomes)} files failed or exceeded their budget (saved {saved} bytes)")
+        return 1
+    
+    print(f"🎉 Saved {saved} bytes across {len(outcomes)} files")
+    return 0
+
+def run_splash(args):
+    from .splash import SPLASH_TARGETS, create_splash_screens
+    
+    print("🖼  Creating splash screens...")
+    print("")
+    
+    start = time.perf_counter()
+    results = create_splash_screens(args.out or SPLASH_TARGETS, size=args.size, force=args.force)
+    elapsed = time.perf_counter() - start
+    
+    failures = 0
+    for result in results:
+        path = os.path.relpath(result.path)
+        if result.status == "failed":
+            failures += 1
+            print(f"  ❌ {path}: {result.error}")
+        else:
+            print(f"  {'✅' if result.status == 'written' else '✨'} {path} ({result.bytes} bytes, {result.status})")
+        if result.over_budget:
+            failures += 1
+            print(f"  ⚠️  {path} is {result.bytes} bytes, over its {result.budget} byte budget")
+    
+    print("")
+    if failures:
+        print(f"❌ {failures} of {len(results)} splash files failed or exceeded their budget ({elapsed:.2f}s)")
+        return 1
+    
+    print(f"🎉 Splash screens up to date ({elapsed:.2f}s)")
+    return 0
+
+def run_images(args):
+    from .responsive import PUBLIC_DIR, RESPONSIVE_SOURCES, build_responsive_images
+    
+    print("🖼  Building responsive image variants...")
+    print("")
+    
+    source_dirs = [os.path.join(PUBLIC_DIR, path) for path in args.src] if args.src else RESPONSIVE_SOURCES
+    
+    start = time.perf_counter()
+    results = build_responsive_images(source_dirs, formats=args.format, jobs=args.jobs, force=args.force)
+    elapsed = time.perf_counter() - start
+    
+    failures = 0
+    for result in results:
+        if result.status == "failed":
+            failures += 1
+            print(f"  ❌ {result.url}: {result.error}")
+        else:
+            print(f"  {'✅' if result.status == 'written' else '✨'} {result.url} ({result.variants} variants, {result.bytes} bytes, {result.status})")
+    
+    print("")
+    if failures:
+        print(f"❌ {failures} of {len(results)} images failed ({elapsed:.2f}s)")
+        return 1
+    
+    print(f"🎉 {len(results)} images up to date ({elapsed:.2f}s)")
+    return 0
+
+def run_index(args):
+    from .asset_index import INDEX_PATH, PLACEHOLDERS_PATH, build_asset_index
+    from .responsive import PUBLIC_DIR
+    
+    print("🔎 Indexing image assets...")
+    print("")
+    
+    source_dirs = [os.path.join(PUBLIC_DIR, path) for path in args.src] if args.src else [PUBLIC_DIR]
+    output_path = args.out or INDEX_PATH
+    placeholders_path = args.placeholders or PLACEHOLDERS_PATH
+    
+    start = time.perf_counter()
+    records, exact, near, failures = build_asset_index(
+        source_dirs, output_path, args.jobs, args.max_distance, placeholders_path
+    )
+    elapsed = time.perf_counter() - start
+    
+    for url, error in failures:
+        print(f"  ❌ {url}: {error}")
+    for urls in exact:
+        print(f"  ⚠️  Identical files: {', '.join(urls)}")
+    for first, second, distance in near:
+        print(f"  ⚠️  Near duplicates (distance {distance}): {first}, {second}")
+    
+    print("")
+    if failures:
+        print(f"❌ {len(failures)} of {len(records) + len(failures)} images could not be indexed ({elapsed:.2f}s)")
+        return 1
+    
+    print(
+        f"🎉 Indexed {len(records)} images into {os.path.relpath(output_path)} "
+        f"and {os.path.relpath(placeholders_path)} ({elapsed:.2f}s)"
+    )
+    return 1 if args.fail_on_duplicates and (exact or near) else 0
+
+def run_watch(args):
+    from .icons import ICON_TARGETS
+    from .watch import watch_design
+    
+    output_dirs = args.out or (ICON_TARGETS if args.write else [])
+    
+    print(f"👀 Watching {os.path.relpath(args.design)} (Ctrl-C to stop)")
+    print("")
+    
+    try:
+        watch_design(
+            args.design,
+            output_dirs,
+            args.preview_dir,
+            supersample=args.supersample,
+            jobs=args.jobs,
+            interval=args.interval,
+            once=args.once
+        )
+    except KeyboardInterrupt:
+        print("")
+    return 0
+
+def add_encoding_arguments(parser):
+    from .budget import BUDGET_BYTES_PER_PIXEL
+    
+    parser.add_argument(
+        "--max-error",
+        type=int,
+        default=0,
+        help="allow a quantized palette within this many levels per channel (default: 0, lossless)"
+    )
+    parser.add_argument(
+        "--budget-bpp",
+        type=float,
+        default=None,
+        help=f"byte budget per pixel on top of a fixed allowance (default: {BUDGET_BYTES_PER_PIXEL})"
+    )
+
+def build_parser():
+    from .icons import MASTER_SIZE, DEFAULT_SUPERSAMPLE, DESIGN_PATH, PREVIEW_DIR
+    
+    parser = argparse.ArgumentParser(prog="python -m scripts.assets", description="Generate Stacks image assets")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    icons = subparsers.add_parser("icons", help="generate iOS app icons")
+    icons.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=None,
+        help="worker processes for render and encode (default: CPU count)"
+    )
+    icons.add_argument(
+        "--only",
+        action="append",
+        metavar="PATTERN",
+        help="only build icons whose filename matches this glob or whose pixel size equals it (repeatable)"
+    )
+    icons.add_argument(
+        "--out",
+        action="append",
+        metavar="DIR",
+        help="write to this appiconset directory instead of the repo targets (repeatable)"
+    )
+    icons.add_argument(
+        "--render",
+        choices=["master", "direct"],
+        default="master",
+        help="downscale one master render (default) or redraw at every size"
+    )
+    icons.add_argument(
+        "--supersample",
+        type=int,
+        default=DEFAULT_SUPERSAMPLE,
+        help=f"master render scale factor over {MASTER_SIZE}px (default: %(default)s)"
+    )
+    icons.add_argument(
+        "--force",
+        action="store_true",
+        help="rebuild every icon even if the manifest says it is up to date"
+    )
+    icons.add_argument(
+        "--design",
+        metavar="PATH",
+        help="read design parameters from this spec file (default: scripts/assets/icon-design.json)"
+    )
+    add_encoding_arguments(icons)
+    icons.set_defaults(handler=run_icons)
+    
+    watch = subparsers.add_parser("watch", help="keep the renderer warm and preview icon design edits as they are saved")
+    watch.add_argument(
+        "--design",
+        default=DESIGN_PATH,
+        metavar="PATH",
+        help="design spec file to watch (default: scripts/assets/icon-design.json)"
+    )
+    watch.add_argument(
+        "--preview-dir",
+        default=PREVIEW_DIR,
+        metavar="DIR",
+        help="where the 1024px and 20px previews are written (default: .icon-preview)"
+    )
+    watch.add_argument(
+        "--write",
+        action="store_true",
+        help="also update the repo appiconsets after each change"
+    )
+    watch.add_argument(
+        "--out",
+        action="append",
+        metavar="DIR",
+        help="update this appiconset directory after each change (repeatable, implies --write)"
+    )
+    watch.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=None,
+        help="worker processes for encoding changed icons (default: CPU count)"
+    )
+    watch.add_argument(
+        "--supersample",
+        type=int,
+        default=DEFAULT_SUPERSAMPLE,
+        help=f"master render scale factor over {MASTER_SIZE}px (default: %(default)s)"
+    )
+    watch.add_argument(
+        "--interval",
+        type=float,
+        default=0.1,
+        help="seconds between checks of the spec file (default: %(default)s)"
+    )
+    watch.add_argument(
+        "--once",
+        action="store_true",
+        help="build once and exit instead of watching"
+    )
+    watch.set_defaults(handler=run_watch)
+    
+    optimize = subparsers.add_parser("optimize", help="losslessly re-encode existing PNGs to their smallest form")
+    optimize.add_argument("paths", nargs="+", metavar="PNG")
+    optimize.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=None,
+        help="worker processes (default: CPU count)"
+    )
+    add_encoding_arguments(optimize)
+    optimize.set_defaults(handler=run_optimize)
+    
+    splash = subparsers.add_parser("splash", help="generate splash screens from the icon design")
+    splash.add_argument(
+        "--out",
+        action="append",
+        metavar="DIR",
+        help="write to this imageset directory instead of the repo targets (repeatable)"
+    )
+    splash.add_argument(
+        "--size",
+        type=int,
+        default=2732,
+        help="splash edge length in pixels (default: %(default)s)"
+    )
+    splash.add_argument(
+        "--force",
+        action="store_true",
+        help="rebuild every variant even if the manifest says it is up to date"
+    )
+    splash.set_defaults(handler=run_splash)
+    
+    images = subparsers.add_parser("images", help="build responsive WebP/AVIF variants for public/ images")
+    images.add_argument(
+        "--src",
+        action="append",
+        metavar="DIR",
+        help="directory under public/ to process instead of images/ and 'demo book covers/' (repeatable)"
+    )
+    images.add_argument(
+        "--format",
+        action="append",
+        choices=["avif", "webp"],
+        help="output format (repeatable, default: every format Pillow can encode)"
+    )
+    images.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=None,
+        help="worker processes (default: CPU count)"
+    )
+    images.add_argument(
+        "--force",
+        action="store_true",
+        help="rebuild every image even if the manifest says it is up to date"
+    )
+    images.set_defaults(handler=run_images)
+    
+    index = subparsers.add_parser("index", help="find duplicate images and index placeholder colors/BlurHash")
+    index.add_argument(
+        "--src",
+        action="append",
+        metavar="DIR",
+        help="directory under public/ to index instead of all of public/ (repeatable)"
+    )
+    index.add_argument(
+        "--out",
+        metavar="PATH",
+        help="audit index (hashes and duplicates) to write (default: .asset-index.json)"
+    )
+    index.add_argument(
+        "--placeholders",
+        metavar="PATH",
+        help="placeholder map for the app to write (default: lib/data/coverPlaceholders.json)"
+    )
+    index.add_argument(
+        "--max-distance",
+        type=int,
+        default=6,
+        help="dHash Hamming distance that counts as a near duplicate (default: %(default)s)"
+    )
+    index.add_argument(
+        "--fail-on-duplicates",
+        action="store_true",
+        help="exit non-zero when exact or near duplicates are found"
+    )
+    index.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=None,
+        help="worker processes (default: CPU count)"
+    )
+    index.set_defaults(handler=run_index)
+    
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
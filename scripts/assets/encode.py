@@ -0,0 +1,210 @@
+"""Smallest-output PNG encoding with palette reduction and byte budgets
+
+Every candidate color representation of an image (RGBA, RGB or gray when
+the alpha or color channels are redundant, an exact palette when there are
+at most 256 colors, and optionally an alpha-aware quantized palette within
+a per-channel error bound) is encoded with several row filters and zlib
+strategies, and the smallest result wins.
+"""
+
+import io
+import zlib
+from dataclasses import dataclass
+
+import numpy as np
+from PIL import Image
+
+from .png import (
+    FILTER_NONE, FILTER_SUB, FILTER_UP, FILTER_PAETH, FILTER_ADAPTIVE,
+    color_chunks, insert_after_header, palette_bit_depth, png_bit_depth, write_png
+)
+
+# Filter and zlib strategy combinations tried for each representation
+FILTERS = [FILTER_NONE, FILTER_SUB, FILTER_UP, FILTER_PAETH, FILTER_ADAPTIVE]
+STRATEGIES = [zlib.Z_DEFAULT_STRATEGY, zlib.Z_FILTERED, zlib.Z_RLE]
+
+# Above this many pixels only the usual winners are tried, since each
+# level-9 pass over a splash-sized image takes a noticeable fraction of a second
+LARGE_IMAGE_PIXELS = 4_000_000
+LARGE_IMAGE_FILTERS = [FILTER_NONE, FILTER_ADAPTIVE]
+LARGE_IMAGE_STRATEGIES = [zlib.Z_DEFAULT_STRATEGY, zlib.Z_RLE]
+
+STRATEGY_NAMES = {
+    zlib.Z_DEFAULT_STRATEGY: "default",
+    zlib.Z_FILTERED: "filtered",
+    zlib.Z_RLE: "rle"
+}
+
+@dataclass
+class EncodedPng:
+    """Winning encoding of an image"""
+    
+    data: bytes
+    method: str
+    
+    @property
+    def bytes(self):
+        return len(self.data)
+
+def exact_palette(pixels):
+    """Index an (h, w, channels) array exactly, or None if over 256 colors
+    
+    Returns (indices, palette rgb, transparency) with translucent entries
+    sorted first so the tRNS chunk stays as short as possible.
+    """
+    
+    channels = pixels.shape[2]
+    flat = pixels.reshape(-1, channels)
+    packed = np.zeros(len(flat), dtype=np.uint32)
+    for channel in range(channels):
+        packed |= flat[:, channel].astype(np.uint32) << (8 * channel)
+    
+    colors, inverse = np.unique(packed, return_inverse=True)
+    if len(colors) > 256:
+        return None
+    
+    entries = np.stack([(colors >> (8 * channel)) & 0xFF for channel in range(channels)], axis=1).astype(np.uint8)
+    alpha = entries[:, 3] if channels == 4 else np.full(len(entries), 255, dtype=np.uint8)
+    
+    order = np.argsort(alpha == 255, kind="stable")
+    remap = np.empty_like(order)
+    remap[order] = np.arange(len(order))
+    
+    indices = remap[inverse].astype(np.uint8).reshape(pixels.shape[:2])
+    palette = entries[order, :3]
+    transparency = alpha[order]
+    transparency = transparency[:np.count_nonzero(transparency < 255)]
+    
+    return indices, palette, transparency
+
+def quantized_palette(img, max_error):
+    """Alpha-aware 256-color palette, or None if any channel drifts past max_error"""
+    
+    method = Image.Quantize.FASTOCTREE if img.mode == "RGBA" else Image.Quantize.MEDIANCUT
+    quantized = img.quantize(256, method=method, dither=Image.Dither.NONE)
+    restored = np.asarray(quantized.convert(img.mode))
+    
+    if np.abs(restored.astype(np.int16) - np.asarray(img, dtype=np.int16)).max() > max_error:
+        return None
+    
+    return exact_palette(restored)
+
+# 8-bit modes the candidates can represent exactly (P is expanded to RGBA,
+# palette alpha included)
+CANDIDATE_MODES = ("RGBA", "RGB", "LA", "L", "P")
+
+def supports_candidates(img):
+    """Whether candidate_representations can hold every pixel of img exactly
+    
+    Higher bit depths (I;16, I, F) would be truncated, and a tRNS color key
+    on L or RGB images would be lost, so those are left to Pillow.
+    """
+    
+    if img.mode not in CANDIDATE_MODES:
+        return False
+    return img.mode == "P" or "transparency" not in img.info
+
+def candidate_representations(img, max_error=0):
+    """Yield (label, pixels, mode, palette, transparency, bit depth) options"""
+    
+    if img.mode == "P":
+        img = img.convert("RGBA")
+    
+    pixels = np.asarray(img)
+    mode = img.mode
+    
+    # Drop a fully opaque alpha channel, then redundant color channels
+    if mode in ("RGBA", "LA") and (pixels[..., -1] == 255).all():
+        pixels = pixels[..., :-1]
+        mode = mode[:-1]
+        img = Image.fromarray(pixels, mode)
+    if mode in ("RGBA", "RGB"):
+        rgb = pixels[..., :3]
+        if (rgb[..., 0] == rgb[..., 1]).all() and (rgb[..., 1] == rgb[..., 2]).all():
+            mode = "LA" if mode == "RGBA" else "L"
+            pixels = pixels[..., [0, 3]] if mode == "LA" else rgb[..., 0]
+            img = Image.fromarray(pixels, mode)
+    
+    if pixels.ndim == 2:
+        yield mode.lower(), pixels, mode, None, None, 8
+        return
+    
+    yield mode.lower(), pixels, mode, None, None, 8
+    
+    if mode in ("RGBA", "RGB"):
+        indexed = exact_palette(pixels)
+        label = "palette"
+        if indexed is None and max_error > 0:
+            indexed = quantized_palette(img, max_error)
+            label = f"quantized(±{max_error})"
+        if indexed is not None:
+            indices, palette, transparency = indexed
+            yield label, indices, "P", palette, transparency, palette_bit_depth(len(palette))
+
+def encode_png_smallest(img, max_error=0, chunks=b""):
+    """Encode an image to the smallest PNG across representations and settings
+    
+    With max_error=0 every candidate decodes to exactly the input pixels;
+    a positive max_error also admits a quantized palette whose channels stay
+    within that many levels of the original. Images the custom writer cannot
+    hold exactly (see supports_candidates) only get Pillow's encoding.
+    chunks (serialized, e.g. from png.color_chunks) are written after IHDR
+    in the result.
+    """
+    
+    large = img.width * img.height > LARGE_IMAGE_PIXELS
+    filters = LARGE_IMAGE_FILTERS if large else FILTERS
+    strategies = LARGE_IMAGE_STRATEGIES if large else STRATEGIES
+    
+    # Pillow's own optimized encoder is the baseline to beat; its ICC
+    # profile is left out so every candidate carries the same chunks
+    buffer = io.BytesIO()
+    img.save(buffer, "PNG", optimize=True, icc_profile=None)
+    best = EncodedPng(buffer.getvalue(), "pillow")
+    
+    representations = candidate_representations(img, max_error) if supports_candidates(img) else []
+    for label, pixels, mode, palette, transparency, bit_depth in representations:
+        for filter_type in filters:
+            for strategy in strategies:
+                data = write_png(pixels, mode, palette, transparency, bit_depth, filter_type, strategy)
+                if len(data) < best.bytes:
+                    best = EncodedPng(data, f"{label}/{filter_type}/{STRATEGY_NAMES[strategy]}")
+    
+    return EncodedPng(insert_after_header(best.data, chunks), best.method)
+
+def optimize_png_file(path, max_error=0):
+    """Re-encode a PNG in place if a smaller encoding exists
+    
+    Color chunks (cHRM, gAMA, iCCP, sRGB) are kept; other ancillary chunks
+    are dropped. Files with 16-bit samples are left alone, since Pillow
+    decodes some of them to 8 bits. Returns (original bytes, final bytes,
+    method), where method is None when the file was left as it was.
+    Raises ValueError for files that are not PNGs.
+    """
+    
+    with open(path, "rb") as f:
+        original = f.read()
+    
+    if png_bit_depth(original) > 8:
+        return len(original), len(original), None
+    
+    chunks = color_chunks(original)
+    with Image.open(io.BytesIO(original)) as img:
+        img.load()
+        result = encode_png_smallest(img, max_error, chunks)
+    
+    if result.bytes >= len(original):
+        return len(original), len(original), None
+    
+    with open(path, "wb") as f:
+        f.write(result.data)
+    
+    return len(original), result.bytes, result.method
+
+def try_optimize_png_file(path, max_error=0):
+    """optimize_png_file, returning the error text instead of raising (worker side)"""
+    
+    try:
+        return optimize_png_file(path, max_error)
+    except Exception as e:
+        return repr(e)
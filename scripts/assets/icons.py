@@ -0,0 +1,468 @@
+"""Book stack app icon renderer and incremental AppIcon builder"""
+
+import os
+import json
+import shutil
+import fnmatch
+import hashlib
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+
+# Pillow and the encoder (NumPy) are imported inside the functions that draw
+# or encode, so manifest checks, no-op builds and argument parsing start
+# without loading them
+from .budget import byte_budget
+
+# Master render settings: the design is drawn once at this size and every
+# smaller AppIcon is derived from it by downscaling
+MASTER_SIZE = 1024
+DEFAULT_SUPERSAMPLE = 2
+
+# Bump when the drawing or resampling code changes in a way that alters output
+GENERATOR_VERSION = 2
+
+# Build manifest written next to each target's Contents.json; git-ignored, so
+# the first run in a checkout re-renders every icon once
+MANIFEST_FILENAME = ".icon-build.json"
+
+# Repository checkout this package lives in (scripts/assets/ -> repo root)
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Output directories, relative to the repository root
+ICON_TARGETS = [
+    os.path.join(REPO_ROOT, "ios", "App", "App", "Assets.xcassets", "AppIcon.appiconset"),
+    os.path.join(REPO_ROOT, "mobile", "ios", "App", "App", "Assets.xcassets", "AppIcon.appiconset")
+]
+
+# Design previews written by watch mode (see watch.py)
+PREVIEW_DIR = os.path.join(REPO_ROOT, ".icon-preview")
+
+# Book stack design parameters (colors and geometry ratios), shared by
+# everything that draws the icon; edit it while `python -m scripts.assets
+# watch` runs to preview changes
+DESIGN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "icon-design.json")
+
+DESIGN_KEYS = {
+    "bg_color", "book_colors", "padding", "book_width", "book_height", "stack_height",
+    "corner_radius", "book_offsets", "book_widths", "book_radius", "highlight_height",
+    "shadow_color", "highlight_color"
+}
+
+def load_design(path=DESIGN_PATH):
+    """Read a design spec file, checking it has every parameter"""
+    
+    with open(path) as f:
+        design = json.load(f)
+    
+    missing = DESIGN_KEYS - design.keys()
+    if missing:
+        raise ValueError(f"Missing design parameters: {', '.join(sorted(missing))}")
+    return design
+
+ICON_DESIGN = load_design()
+
+def create_book_stack_icon(size, shadow_offset=2, design=ICON_DESIGN):
+    """Create a book stack icon with the given size"""
+    
+    from PIL import Image, ImageDraw
+    
+    # Create a new image with transparent background
+    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    draw_book_stack(draw, size, (0, 0), shadow_offset, design)
+    
+    return img
+
+def book_stack_shapes(size, shadow_offset=2, design=ICON_DESIGN):
+    """Rounded rectangles of the icon design as (box, radius, fill), back to front
+    
+    Boxes are (x0, y0, x1, y1) relative to the icon's top-left corner.
+    """
+    
+    # Colors
+    bg_color = tuple(design["bg_color"])
+    book_colors = [tuple(color) for color in design["book_colors"]]
+    
+    # Dimensions
+    padding = size * design["padding"]
+    book_width = (size - 2 * padding) * design["book_width"]
+    book_height = book_width * design["book_height"]
+    stack_height = book_height * design["stack_height"]
+    
+    # Center coordinates
+    center_x = size / 2
+    center_y = size / 2
+    stack_x = center_x - book_width / 2
+    stack_y = center_y - stack_height / 2
+    
+    # Background with rounded corners (simulate iOS app icon shape)
+    corner_radius = size * design["corner_radius"]
+    shapes = [((0, 0, size, size), corner_radius, bg_color)]
+    
+    # Books from bottom to top
+    book_offsets = [book_width * ratio for ratio in design["book_offsets"]]
+    book_widths = [book_width * ratio for ratio in design["book_widths"]]
+    book_radius = book_height * design["book_radius"]
+    
+    for i, (color, offset, width) in enumerate(zip(book_colors[::-1], book_offsets, book_widths)):
+        book_y = stack_y + stack_height - book_height * (i + 1.1)
+        book_x = stack_x + offset
+        
+        # Subtle shadow
+        shapes.append((
+            (book_x + shadow_offset, book_y + shadow_offset,
+             book_x + width + shadow_offset, book_y + book_height + shadow_offset),
+            book_radius,
+            tuple(design["shadow_color"])
+        ))
+        
+        # Book
+        shapes.append(((book_x, book_y, book_x + width, book_y + book_height), book_radius, color))
+        
+        # Highlight on top book
+        if i == 3:  # Top book
+            highlight_height = book_height * design["highlight_height"]
+            shapes.append((
+                (book_x, book_y, book_x + width, book_y + highlight_height),
+                book_radius,
+                tuple(design["highlight_color"])
+            ))
+    
+    return shapes
+
+def draw_book_stack(draw, size, origin=(0, 0), shadow_offset=2, design=ICON_DESIGN):
+    """Draw the icon design with its top-left corner at origin
+    
+    Shapes falling outside the target image are clipped, which lets callers
+    draw a horizontal slice of a larger canvas (see splash.py).
+    """
+    
+    origin_x, origin_y = origin
+    for (x0, y0, x1, y1), radius, fill in book_stack_shapes(size, shadow_offset, design):
+        draw.rounded_rectangle(
+            [(origin_x + x0, origin_y + y0), (origin_x + x1, origin_y + y1)],
+            radius=radius,
+            fill=fill
+        )
+
+def render_master_icon(supersample=DEFAULT_SUPERSAMPLE, design=ICON_DESIGN):
+    """Render the icon once at MASTER_SIZE * supersample"""
+    
+    size = MASTER_SIZE * supersample
+    # Keep the 2px shadow of the 1024 design proportional at any master size
+    return create_book_stack_icon(size, 2 * size / MASTER_SIZE, design)
+
+def build_icon_pyramid(master, sizes, levels=None):
+    """Downscale the master icon to each distinct pixel size
+    
+    Levels are produced by repeated 2x box reduction, and each target size is
+    resampled with Lanczos from the smallest level that is still at least
+    twice its size. Work happens in premultiplied alpha so the transparent
+    corners do not bleed dark fringes into the edges. A levels list passed
+    in is reused and extended, so calls for one size at a time share the
+    reductions (see render_icon_png).
+    """
+    
+    from PIL import Image
+    
+    if levels is None:
+        levels = []
+    if not levels:
+        levels.append(master.convert('RGBa'))
+    icons = {}
+    
+    for size in sorted(set(sizes), reverse=True):
+        depth = 0
+        while levels[depth].width // 2 >= size * 2:
+            depth += 1
+            if depth == len(levels):
+                levels.append(levels[-1].reduce(2))
+        
+        source = levels[depth]
+        if source.width == size:
+            resized = source
+        else:
+            resized = source.resize((size, size), Image.LANCZOS)
+        icons[size] = resized.convert('RGBA')
+    
+    return icons
+
+def load_icon_specs(dir_path):
+    """Read (pixel size, filename) pairs from an appiconset's Contents.json"""
+    
+    with open(os.path.join(dir_path, "Contents.json")) as f:
+        contents = json.load(f)
+    
+    specs = []
+    for image in contents.get("images", []):
+        filename = image.get("filename")
+        if not filename:
+            continue
+        points = float(image["size"].split("x")[0])
+        scale = int(image.get("scale", "1x").rstrip("x"))
+        specs.append((round(points * scale), filename))
+    
+    return specs
+
+def render_key(size, render_mode, supersample, design=ICON_DESIGN, max_error=0):
+    """Hash of every input that determines the icon at a given pixel size"""
+    
+    params = {
+        "version": GENERATOR_VERSION,
+        "design": design,
+        "render_mode": render_mode,
+        "supersample": supersample if render_mode == "master" else None,
+        "max_error": max_error,
+        "size": size
+    }
+    payload = json.dumps(params, sort_keys=True).encode()
+    return hashlib.sha256(payload).hexdigest()
+
+def file_digest(path):
+    """SHA-256 of a file's bytes, or None if it does not exist"""
+    
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+def load_manifest(dir_path, manifest_filename=MANIFEST_FILENAME):
+    """Load a target's build manifest ({filename: {key, sha256}})"""
+    
+    try:
+        with open(os.path.join(dir_path, manifest_filename)) as f:
+            return json.load(f).get("outputs", {})
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_manifest(dir_path, outputs, manifest_filename=MANIFEST_FILENAME):
+    """Write a target's build manifest, leaving it untouched if unchanged"""
+    
+    manifest_path = os.path.join(dir_path, manifest_filename)
+    data = json.dumps({"version": GENERATOR_VERSION, "outputs": outputs}, indent=2, sort_keys=True) + "\n"
+    
+    try:
+        with open(manifest_path) as f:
+            if f.read() == data:
+                return
+    except FileNotFoundError:
+        pass
+    
+    with open(manifest_path, "w") as f:
+        f.write(data)
+
+def write_output(data, digest, output_path, source_path=None):
+    """Write icon bytes, linking to an already written copy when possible
+    
+    Files whose bytes already match are left alone so rebuilds do not touch
+    mtimes or produce git churn.
+    """
+    
+    if file_digest(output_path) == digest:
+        return False
+    
+    tmp_path = output_path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    
+    if source_path:
+        try:
+            os.link(source_path, tmp_path)
+        except OSError:
+            shutil.copyfile(source_path, tmp_path)
+    else:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+    
+    os.replace(tmp_path, output_path)
+    return True
+
+@dataclass
+class IconResult:
+    """Outcome of building one icon file"""
+    
+    path: str
+    size: int
+    status: str  # "written", "unchanged" or "failed"
+    bytes: int = 0
+    error: str = None
+    budget: int = None
+    
+    @property
+    def over_budget(self):
+        return self.budget is not None and self.bytes > self.budget
+
+# Per-process master render and its reduction levels, reused by every job
+# a pool worker (or the serial loop) runs
+_master_cache = {}
+
+def _cached_master(supersample, design):
+    """(master, levels) for build_icon_pyramid, rendered once per process"""
+    
+    key = json.dumps([supersample, design], sort_keys=True)
+    if key not in _master_cache:
+        _master_cache.clear()
+        _master_cache[key] = (render_master_icon(supersample, design), [])
+    return _master_cache[key]
+
+def render_icon_png(size, render_mode="master", supersample=DEFAULT_SUPERSAMPLE,
+                    design=ICON_DESIGN, max_error=0):
+    """Render and encode a single pixel size, returning (png bytes, sha256)"""
+    
+    if render_mode == "master":
+        master, levels = _cached_master(supersample, design)
+        img = build_icon_pyramid(master, [size], levels)[size]
+    else:
+        img = create_book_stack_icon(size, design=design)
+    
+    return encode_icon_png(img, max_error)
+
+def encode_icon_png(img, max_error=0):
+    """Encode an already rendered icon, returning (png bytes, sha256)"""
+    
+    from .encode import encode_png_smallest
+    
+    data = encode_png_smallest(img, max_error).data
+    return data, hashlib.sha256(data).hexdigest()
+
+def matches_only(filename, size, only):
+    """Whether an icon is selected by --only filename globs or pixel sizes"""
+    
+    if not only:
+        return True
+    return any(pattern == str(size) or fnmatch.fnmatch(filename, pattern) for pattern in only)
+
+def render_sizes(sizes, render_mode="master", supersample=DEFAULT_SUPERSAMPLE,
+                 design=ICON_DESIGN, jobs=None, max_error=0, pyramid=None):
+    """Render and encode each pixel size, across a process pool when jobs > 1
+    
+    With a pyramid (see build_icon_pyramid) of the same design, its images
+    are encoded as they are instead of rendering the master again.
+    Returns {size: (png bytes, sha256) or Exception}.
+    """
+    
+    # Largest first: the 1024px encode dominates and should start earliest
+    sizes = sorted(set(sizes), reverse=True)
+    jobs = min(jobs or os.cpu_count() or 1, len(sizes))
+    results = {}
+    
+    def job(size):
+        if pyramid is not None:
+            return encode_icon_png, (pyramid[size], max_error)
+        return render_icon_png, (size, render_mode, supersample, design, max_error)
+    
+    if jobs <= 1:
+        for size in sizes:
+            fn, args = job(size)
+            try:
+                results[size] = fn(*args)
+            except Exception as e:
+                results[size] = e
+        return results
+    
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {}
+        for size in sizes:
+            fn, args = job(size)
+            futures[size] = pool.submit(fn, *args)
+        for size, future in futures.items():
+            try:
+                results[size] = future.result()
+            except Exception as e:
+                results[size] = e
+    
+    return results
+
+def ensure_contents(dir_path, contents_template=None):
+    """Give an appiconset a Contents.json, copied from contents_template if missing"""
+    
+    contents_path = os.path.join(dir_path, "Contents.json")
+    if os.path.exists(contents_path):
+        return
+    if not contents_template:
+        raise FileNotFoundError(f"No Contents.json in {dir_path}")
+    os.makedirs(dir_path, exist_ok=True)
+    shutil.copyfile(os.path.join(contents_template, "Contents.json"), contents_path)
+
+def create_all_ios_icons(output_dirs=ICON_TARGETS, render_mode="master",
+                         supersample=DEFAULT_SUPERSAMPLE, force=False, jobs=None,
+                         only=None, design=ICON_DESIGN, contents_template=None,
+                         max_error=0, budget_bpp=None, pyramid=None):
+    """Create all iOS app icon sizes and return an IconResult per file
+    
+    The icons for each output directory come from its Contents.json; a
+    directory without one gets a copy of contents_template/Contents.json
+    when given. A manifest next to it records the render key and output hash
+    of every file, so unchanged icons are skipped and each pixel size is
+    rendered and encoded once, then linked or copied to the other targets.
+    
+    render_mode "master" draws the design once and downscales it to every
+    size; "direct" redraws the design from scratch at each size. Icons are
+    encoded with encode_png_smallest (lossless unless max_error > 0) and
+    each result carries its byte budget (see budget.byte_budget). Callers
+    that already hold a master-mode pyramid of this design and supersample
+    (watch mode) pass it so stale sizes are only encoded.
+    """
+    
+    # Collect the icons each target needs
+    targets = []
+    for dir_path in output_dirs:
+        ensure_contents(dir_path, contents_template)
+        specs = [
+            (size, filename) for size, filename in load_icon_specs(dir_path)
+            if matches_only(filename, size, only)
+        ]
+        targets.append((dir_path, specs, load_manifest(dir_path)))
+    
+    # Find the pixel sizes whose outputs are missing or stale
+    stale_sizes = set()
+    for dir_path, specs, manifest in targets:
+        for size, filename in specs:
+            entry = manifest.get(filename, {})
+            if force or entry.get("key") != render_key(size, render_mode, supersample, design, max_error):
+                stale_sizes.add(size)
+            elif file_digest(os.path.join(dir_path, filename)) != entry.get("sha256"):
+                stale_sizes.add(size)
+    
+    encoded = render_sizes(stale_sizes, render_mode, supersample, design, jobs, max_error, pyramid) if stale_sizes else {}
+    budget_args = () if budget_bpp is None else (budget_bpp,)
+    
+    # Write each icon, reusing the first file written for a size
+    results = []
+    written = {}
+    for dir_path, specs, manifest in targets:
+        outputs = dict(manifest)
+        for size, filename in specs:
+            output_path = os.path.join(dir_path, filename)
+            budget = byte_budget(size, size, *budget_args)
+            
+            if size not in encoded:
+                results.append(IconResult(output_path, size, "unchanged", manifest[filename].get("bytes", 0), budget=budget))
+                continue
+            
+            if isinstance(encoded[size], Exception):
+                results.append(IconResult(output_path, size, "failed", error=repr(encoded[size])))
+                outputs.pop(filename, None)
+                continue
+            
+            data, digest = encoded[size]
+            try:
+                changed = write_output(data, digest, output_path, written.get(size))
+            except OSError as e:
+                results.append(IconResult(output_path, size, "failed", error=repr(e)))
+                outputs.pop(filename, None)
+                continue
+            
+            written.setdefault(size, output_path)
+            results.append(IconResult(output_path, size, "written" if changed else "unchanged", len(data), budget=budget))
+            outputs[filename] = {
+                "key": render_key(size, render_mode, supersample, design, max_error),
+                "sha256": digest,
+                "size": size,
+                "bytes": len(data)
+            }
+        
+        save_manifest(dir_path, outputs)
+    
+    return results
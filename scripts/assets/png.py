@@ -0,0 +1,241 @@
+"""Minimal PNG writer with explicit control over row filters and zlib strategy
+
+Pillow always picks its own filters and zlib settings, so the encoder in
+encode.py uses this writer to try several combinations and keep the
+smallest. Pixels are passed as NumPy arrays: (height, width) for L and P,
+(height, width, channels) for LA, RGB and RGBA.
+"""
+
+import zlib
+import struct
+
+import numpy as np
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# PNG color type and channel count per mode
+COLOR_TYPES = {"L": (0, 1), "RGB": (2, 3), "P": (3, 1), "LA": (4, 2), "RGBA": (6, 4)}
+
+FILTER_NONE = 0
+FILTER_SUB = 1
+FILTER_UP = 2
+FILTER_AVERAGE = 3
+FILTER_PAETH = 4
+FILTER_ADAPTIVE = "adaptive"
+
+# Ancillary chunks that change how colors are interpreted; they must come
+# before PLTE and IDAT, so they are carried over right after IHDR
+COLOR_CHUNK_TYPES = (b"cHRM", b"gAMA", b"iCCP", b"sRGB")
+
+def png_chunk(chunk_type, data):
+    """Serialize one length-prefixed, CRC-suffixed PNG chunk"""
+    
+    crc = zlib.crc32(chunk_type + data) & 0xFFFFFFFF
+    return struct.pack(">I", len(data)) + chunk_type + data + struct.pack(">I", crc)
+
+def read_chunks(data):
+    """Yield (chunk type, body) for each chunk of PNG bytes"""
+    
+    if not data.startswith(PNG_SIGNATURE):
+        raise ValueError("Not a PNG file")
+    
+    offset = len(PNG_SIGNATURE)
+    while offset + 8 <= len(data):
+        length, chunk_type = struct.unpack(">I4s", data[offset:offset + 8])
+        yield chunk_type, data[offset + 8:offset + 8 + length]
+        offset += 12 + length
+
+def png_bit_depth(data):
+    """Bit depth per sample from the IHDR chunk of PNG bytes"""
+    
+    chunk_type, body = next(read_chunks(data))
+    if chunk_type != b"IHDR":
+        raise ValueError("PNG does not start with IHDR")
+    return body[8]
+
+def color_chunks(data):
+    """Serialized cHRM/gAMA/iCCP/sRGB chunks of PNG bytes, in file order"""
+    
+    return b"".join(
+        png_chunk(chunk_type, body)
+        for chunk_type, body in read_chunks(data)
+        if chunk_type in COLOR_CHUNK_TYPES
+    )
+
+def insert_after_header(data, chunks):
+    """Splice serialized chunks into PNG bytes directly after IHDR"""
+    
+    if not chunks:
+        return data
+    # Signature plus the fixed-size IHDR chunk (13 bytes of body)
+    offset = len(PNG_SIGNATURE) + 12 + 13
+    return data[:offset] + chunks + data[offset:]
+
+def palette_bit_depth(colors):
+    """Smallest PNG bit depth that can index the given number of colors"""
+    
+    for depth in (1, 2, 4):
+        if colors <= 1 << depth:
+            return depth
+    return 8
+
+def pack_rows(pixels, mode, bit_depth=8):
+    """Flatten pixels to (height, stride) bytes, bit-packing depths below 8"""
+    
+    height = pixels.shape[0]
+    if bit_depth == 8:
+        return np.ascontiguousarray(pixels, dtype=np.uint8).reshape(height, -1)
+    
+    per_byte = 8 // bit_depth
+    width = pixels.shape[1]
+    padded = np.zeros((height, -(-width // per_byte) * per_byte), dtype=np.uint8)
+    padded[:, :width] = pixels
+    groups = padded.reshape(height, -1, per_byte)
+    shifts = np.arange(per_byte - 1, -1, -1, dtype=np.uint8) * bit_depth
+    return np.bitwise_or.reduce(groups << shifts, axis=2).astype(np.uint8)
+
+def _paeth(left, up, up_left):
+    estimate = left + up - up_left
+    dist_left = np.abs(estimate - left)
+    dist_up = np.abs(estimate - up)
+    dist_up_left = np.abs(estimate - up_left)
+    return np.where(
+        (dist_left <= dist_up) & (dist_left <= dist_up_left),
+        left,
+        np.where(dist_up <= dist_up_left, up, up_left)
+    )
+
+def filter_rows(rows, bpp, filter_type=FILTER_ADAPTIVE, prev_row=None):
+    """Apply a PNG filter to packed rows, returning (height, stride + 1) bytes
+    
+    prev_row is the last unfiltered row of the previous strip when rows are
+    filtered in pieces. FILTER_ADAPTIVE picks, per row, the filter with the
+    smallest sum of absolute signed residuals (the libpng heuristic).
+    """
+    
+    height, stride = rows.shape
+    current = rows.astype(np.int16)
+    
+    up = np.empty_like(current)
+    up[0] = 0 if prev_row is None else prev_row
+    up[1:] = current[:-1]
+    
+    left = np.zeros_like(current)
+    left[:, bpp:] = current[:, :-bpp]
+    up_left = np.zeros_like(current)
+    up_left[:, bpp:] = up[:, :-bpp]
+    
+    predictors = {
+        FILTER_NONE: 0,
+        FILTER_SUB: left,
+        FILTER_UP: up,
+        FILTER_AVERAGE: (left + up) >> 1,
+        FILTER_PAETH: _paeth(left, up, up_left)
+    }
+    
+    if filter_type == FILTER_ADAPTIVE:
+        candidates = np.stack([(current - predictors[f]) & 0xFF for f in range(5)])
+        cost = np.abs(candidates.astype(np.uint8).view(np.int8).astype(np.int32)).sum(axis=2)
+        chosen = cost.argmin(axis=0)
+        filtered = candidates[chosen, np.arange(height)]
+    else:
+        chosen = np.full(height, filter_type)
+        filtered = (current - predictors[filter_type]) & 0xFF
+    
+    out = np.empty((height, stride + 1), dtype=np.uint8)
+    out[:, 0] = chosen
+    out[:, 1:] = filtered
+    return out
+
+def header_chunks(width, height, mode, bit_depth=8, palette=None, transparency=None):
+    """IHDR plus PLTE/tRNS chunks for an image"""
+    
+    color_type = COLOR_TYPES[mode][0]
+    chunks = [png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, bit_depth, color_type, 0, 0, 0))]
+    
+    if mode == "P":
+        chunks.append(png_chunk(b"PLTE", bytes(np.asarray(palette, dtype=np.uint8).ravel())))
+        if transparency is not None and len(transparency):
+            chunks.append(png_chunk(b"tRNS", bytes(np.asarray(transparency, dtype=np.uint8))))
+    
+    return b"".join(chunks)
+
+def bytes_per_pixel(mode, bit_depth=8):
+    """Filter unit in bytes (at least one byte for sub-byte depths)"""
+    
+    return max(1, COLOR_TYPES[mode][1] * bit_depth // 8)
+
+def write_png(pixels, mode, palette=None, transparency=None, bit_depth=8,
+              filter_type=FILTER_ADAPTIVE, strategy=zlib.Z_DEFAULT_STRATEGY, level=9):
+    """Encode a pixel array to PNG bytes"""
+    
+    height, width = pixels.shape[:2]
+    rows = pack_rows(pixels, mode, bit_depth)
+    filtered = filter_rows(rows, bytes_per_pixel(mode, bit_depth), filter_type)
+    
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 15, 9, strategy)
+    idat = compressor.compress(filtered.tobytes()) + compressor.flush()
+    
+    return b"".join([
+        PNG_SIGNATURE,
+        header_chunks(width, height, mode, bit_depth, palette, transparency),
+        png_chunk(b"IDAT", idat),
+        png_chunk(b"IEND", b"")
+    ])
+
+class PngStreamWriter:
+    """Write a PNG strip by strip without holding the whole image
+    
+    Rows are packed, filtered against the previous strip's last row and fed
+    to zlib as they arrive; compressed data is flushed as IDAT chunks of at
+    most IDAT_CHUNK_BYTES, so memory use depends on the strip size only.
+    """
+    
+    IDAT_CHUNK_BYTES = 1 << 16
+    
+    def __init__(self, f, width, height, mode, palette=None, transparency=None, bit_depth=8,
+                 filter_type=FILTER_ADAPTIVE, strategy=zlib.Z_DEFAULT_STRATEGY, level=9):
+        self.f = f
+        self.height = height
+        self.mode = mode
+        self.bit_depth = bit_depth
+        self.filter_type = filter_type
+        self.rows_written = 0
+        self.prev_row = None
+        self.pending = b""
+        self.compressor = zlib.compressobj(level, zlib.DEFLATED, 15, 9, strategy)
+        
+        f.write(PNG_SIGNATURE)
+        f.write(header_chunks(width, height, mode, bit_depth, palette, transparency))
+    
+    def write_rows(self, pixels):
+        """Append a strip of rows (same layout as write_png's pixels)"""
+        
+        rows = pack_rows(pixels, self.mode, self.bit_depth)
+        filtered = filter_rows(rows, bytes_per_pixel(self.mode, self.bit_depth), self.filter_type, self.prev_row)
+        self.prev_row = rows[-1].astype(np.int16)
+        self.rows_written += len(rows)
+        
+        self._emit(self.compressor.compress(filtered.tobytes()))
+    
+    def close(self):
+        """Finish the zlib stream and write the trailing chunks"""
+        
+        if self.rows_written != self.height:
+            raise ValueError(f"Wrote {self.rows_written} rows, expected {self.height}")
+        
+        self._emit(self.compressor.flush(), final=True)
+        self.f.write(png_chunk(b"IEND", b""))
+    
+    def _emit(self, data, final=False):
+        self.pending += data
+        while len(self.pending) >= self.IDAT_CHUNK_BYTES or (final and self.pending):
+            self.f.write(png_chunk(b"IDAT", self.pending[:self.IDAT_CHUNK_BYTES]))
+            self.pending = self.pending[self.IDAT_CHUNK_BYTES:]
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
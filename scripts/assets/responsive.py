@@ -0,0 +1,277 @@
+"""Responsive WebP/AVIF variants for the images served from public/
+
+Every source image is decoded once, EXIF-transposed and stripped of
+metadata, and encoded at each configured width it can fill. The results are
+described in public/responsive/manifest.json, keyed by the original public
+URL, so image components can build srcset/sizes without probing files.
+A variant that is not smaller than its source file is dropped and listed
+under the entry's useOriginal instead, since serving the original is then
+cheaper at every width.
+Sources whose bytes and settings are unchanged are skipped, and the rest
+are processed across a process pool.
+"""
+
+import io
+import os
+import json
+import hashlib
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, ImageOps, features
+
+from .icons import REPO_ROOT, file_digest
+
+PUBLIC_DIR = os.path.join(REPO_ROOT, "public")
+RESPONSIVE_DIR = os.path.join(PUBLIC_DIR, "responsive")
+RESPONSIVE_MANIFEST = os.path.join(RESPONSIVE_DIR, "manifest.json")
+
+# Bump when resizing, encoding or naming changes in a way that alters output
+RESPONSIVE_VERSION = 3
+
+RESPONSIVE_SOURCES = [
+    os.path.join(PUBLIC_DIR, "images"),
+    os.path.join(PUBLIC_DIR, "demo book covers")
+]
+
+RESPONSIVE_WIDTHS = [320, 640, 960, 1280, 1920]
+
+SOURCE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+
+# Pillow save options per output format
+FORMAT_OPTIONS = {
+    "avif": {"quality": 55, "speed": 6},
+    "webp": {"quality": 80, "method": 6}
+}
+
+@dataclass
+class ResponsiveResult:
+    """Outcome of processing one source image"""
+    
+    url: str
+    status: str  # "written", "unchanged" or "failed"
+    variants: int = 0
+    bytes: int = 0
+    error: str = None
+
+def available_formats():
+    """Output formats this Pillow build can encode, best first"""
+    
+    return [name for name in FORMAT_OPTIONS if features.check(name)]
+
+def public_url(path):
+    """URL a file under public/ is served from"""
+    
+    return "/" + os.path.relpath(path, PUBLIC_DIR).replace(os.sep, "/")
+
+def find_sources(source_dirs=RESPONSIVE_SOURCES):
+    """All source images in the given directories, sorted for stable output"""
+    
+    sources = []
+    for dir_path in source_dirs:
+        for root, dirs, files in os.walk(dir_path):
+            dirs[:] = sorted(d for d in dirs if os.path.join(root, d) != RESPONSIVE_DIR)
+            for filename in sorted(files):
+                if filename.lower().endswith(SOURCE_EXTENSIONS):
+                    sources.append(os.path.join(root, filename))
+    return sources
+
+def variant_key(source_digest, widths, formats):
+    """Hash of the source bytes and every setting that shapes its variants"""
+    
+    params = {
+        "version": RESPONSIVE_VERSION,
+        "source": source_digest,
+        "widths": widths,
+        "formats": {name: FORMAT_OPTIONS[name] for name in formats}
+    }
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()
+
+def target_widths(intrinsic_width, widths=RESPONSIVE_WIDTHS):
+    """Configured widths below the intrinsic width, plus the intrinsic width
+    when it is smaller than the largest configured one (never upscale)"""
+    
+    selected = [width for width in widths if width < intrinsic_width]
+    if intrinsic_width <= max(widths):
+        selected.append(intrinsic_width)
+    return selected
+
+def to_srgb(img, icc_profile):
+    """Convert an image from its embedded profile to sRGB (RGB or RGBA)"""
+    
+    from PIL import ImageCms
+    
+    source = ImageCms.ImageCmsProfile(io.BytesIO(icc_profile))
+    output_mode = "RGBA" if "A" in img.mode else "RGB"
+    return ImageCms.profileToProfile(img, source, ImageCms.createProfile("sRGB"), outputMode=output_mode)
+
+def build_variants(source_path, key, widths, formats, output_dir=RESPONSIVE_DIR):
+    """Decode one source and write all of its variants; returns its manifest entry
+    
+    Runs in a worker process.
+    """
+    
+    # Keep the source extension so foo.jpg and foo.png do not share variants
+    stem, extension = os.path.splitext(os.path.relpath(source_path, PUBLIC_DIR))
+    stem = f"{stem}-{extension.lstrip('.').lower()}"
+    
+    with Image.open(source_path) as img:
+        # The color profile is the one piece of metadata worth keeping
+        icc_profile = img.info.get("icc_profile")
+        # Apply the EXIF orientation, then drop EXIF/XMP by re-encoding pixels only
+        img = ImageOps.exif_transpose(img)
+        has_alpha = img.mode in ("RGBA", "LA", "PA") or "transparency" in img.info
+        if icc_profile and img.mode not in ("RGB", "RGBA"):
+            # A CMYK or gray profile does not describe RGB output, so convert
+            # through it to sRGB instead of attaching it
+            img = to_srgb(img, icc_profile)
+            icc_profile = None
+        img = img.convert("RGBA" if has_alpha else "RGB")
+    
+    source_bytes = os.path.getsize(source_path)
+    entry = {"width": img.width, "height": img.height, "bytes": source_bytes, "key": key, "variants": [], "useOriginal": []}
+    
+    # Largest first so each step resamples from the nearest larger variant
+    current = img
+    for width in sorted(target_widths(img.width, widths), reverse=True):
+        height = max(1, round(img.height * width / img.width))
+        if current.width != width:
+            current = current.resize((width, height), Image.LANCZOS, reducing_gap=3.0)
+        
+        for name in formats:
+            output_path = os.path.join(output_dir, f"{stem}-{width}.{name}")
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            tmp_path = output_path + ".tmp"
+            options = dict(FORMAT_OPTIONS[name], icc_profile=icc_profile) if icc_profile else FORMAT_OPTIONS[name]
+            current.save(tmp_path, name.upper(), **options)
+            
+            if os.path.getsize(tmp_path) >= source_bytes:
+                # Re-encoding near the intrinsic width can cost more than
+                # the source; the original is the better download there
+                os.remove(tmp_path)
+                if os.path.exists(output_path):
+                    os.remove(output_path)
+                entry["useOriginal"].append({"format": name, "width": width})
+                continue
+            
+            os.replace(tmp_path, output_path)
+            
+            entry["variants"].append({
+                "src": public_url(output_path),
+                "format": name,
+                "width": width,
+                "height": height,
+                "bytes": os.path.getsize(output_path)
+            })
+    
+    entry["variants"].sort(key=lambda variant: (variant["format"], variant["width"]))
+    entry["useOriginal"].sort(key=lambda variant: (variant["format"], variant["width"]))
+    return entry
+
+def load_responsive_manifest(manifest_path=RESPONSIVE_MANIFEST):
+    try:
+        with open(manifest_path) as f:
+            return json.load(f).get("images", {})
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def read_text(path):
+    """A text file's contents, or None if it does not exist"""
+    
+    try:
+        with open(path) as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+def entry_is_fresh(entry, key):
+    """Whether a manifest entry matches key and all its variant files exist"""
+    
+    return entry.get("key") == key and all(
+        os.path.exists(os.path.join(PUBLIC_DIR, variant["src"].lstrip("/")))
+        for variant in entry.get("variants", [])
+    )
+
+def remove_variants(entry, keep=()):
+    """Delete an entry's variant files except the given public URLs"""
+    
+    for variant in entry.get("variants", []):
+        if variant["src"] not in keep:
+            path = os.path.join(PUBLIC_DIR, variant["src"].lstrip("/"))
+            if os.path.exists(path):
+                os.remove(path)
+
+def is_under(path, dirs):
+    """Whether path lies inside any of the given directories"""
+    
+    path = os.path.abspath(path)
+    return any(os.path.commonpath([path, os.path.abspath(dir_path)]) == os.path.abspath(dir_path) for dir_path in dirs)
+
+def build_responsive_images(source_dirs=RESPONSIVE_SOURCES, widths=RESPONSIVE_WIDTHS,
+                            formats=None, jobs=None, force=False, manifest_path=RESPONSIVE_MANIFEST):
+    """Generate variants for every source image and rewrite the manifest
+    
+    Returns a ResponsiveResult per source image.
+    """
+    
+    formats = formats or available_formats()
+    manifest = load_responsive_manifest(manifest_path)
+    sources = find_sources(source_dirs)
+    
+    images = {}
+    results = []
+    stale = []
+    
+    for source_path in sources:
+        url = public_url(source_path)
+        key = variant_key(file_digest(source_path), widths, formats)
+        entry = manifest.get(url, {})
+        if not force and entry_is_fresh(entry, key):
+            images[url] = entry
+            results.append(ResponsiveResult(url, "unchanged", len(entry["variants"]), sum(v["bytes"] for v in entry["variants"])))
+        else:
+            stale.append((url, source_path, key))
+    
+    if stale:
+        # Biggest sources first so the slowest encodes do not start last
+        stale.sort(key=lambda item: os.path.getsize(item[1]), reverse=True)
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [
+                (url, pool.submit(build_variants, source_path, key, widths, formats))
+                for url, source_path, key in stale
+            ]
+            for url, future in futures:
+                try:
+                    entry = future.result()
+                except Exception as e:
+                    results.append(ResponsiveResult(url, "failed", error=repr(e)))
+                    continue
+                
+                remove_variants(manifest.get(url, {}), keep={variant["src"] for variant in entry["variants"]})
+                images[url] = entry
+                results.append(ResponsiveResult(url, "written", len(entry["variants"]), sum(v["bytes"] for v in entry["variants"])))
+    
+    # Drop variants of sources that no longer exist; entries outside the
+    # scanned directories are carried over untouched
+    seen = {result.url for result in results}
+    for url, entry in manifest.items():
+        if url in seen:
+            continue
+        source_path = os.path.join(PUBLIC_DIR, url.lstrip("/"))
+        if os.path.exists(source_path) and not is_under(source_path, source_dirs):
+            images[url] = entry
+        else:
+            remove_variants(entry)
+    
+    # Keep failed sources' previous entries so their old variants stay usable
+    for result in results:
+        if result.status == "failed" and result.url in manifest:
+            images[result.url] = manifest[result.url]
+    
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    data = json.dumps({"version": RESPONSIVE_VERSION, "widths": widths, "formats": formats, "images": dict(sorted(images.items()))}, indent=2) + "\n"
+    if read_text(manifest_path) != data:
+        with open(manifest_path, "w") as f:
+            f.write(data)
+    
+    return sorted(results, key=lambda result: result.url)
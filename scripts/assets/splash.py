@@ -0,0 +1,286 @@
+"""Splash screen generator built on the book stack icon design
+
+Splash images are rendered in horizontal strips of a fixed pixel count and
+streamed straight into PngStreamWriter, so peak memory stays the same
+whatever the output size. Each distinct variant (light and dark appearance)
+is written once per target and referenced from a single-scale
+Splash.imageset Contents.json, instead of three identical 1x/2x/3x copies.
+"""
+
+import os
+import json
+import hashlib
+from dataclasses import dataclass
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from .icons import (
+    ICON_DESIGN, MASTER_SIZE, REPO_ROOT, GENERATOR_VERSION,
+    book_stack_shapes, file_digest, load_manifest, save_manifest, write_output
+)
+from .budget import byte_budget
+from .png import PngStreamWriter
+
+SPLASH_SIZE = 2732
+# Output pixels per strip; strips get shorter as the image gets wider so
+# the working set stays the same at any splash size
+SPLASH_STRIP_PIXELS = 1 << 18
+SPLASH_SUPERSAMPLE = 2
+SPLASH_MANIFEST_FILENAME = ".splash-build.json"
+# Bump when splash rendering changes without a design or icon generator change
+SPLASH_VERSION = 2
+
+# Icon edge length as a fraction of the splash edge
+SPLASH_ICON_FRACTION = 0.2
+
+# Filenames are formatted with the splash size
+SPLASH_VARIANTS = [
+    {"filename": "splash-{size}x{size}.png", "background": (255, 255, 255), "appearance": None},
+    {"filename": "splash-{size}x{size}-dark.png", "background": (17, 24, 39), "appearance": "dark"}
+]
+
+SPLASH_TARGETS = [
+    os.path.join(REPO_ROOT, "ios", "App", "App", "Assets.xcassets", "Splash.imageset"),
+    os.path.join(REPO_ROOT, "mobile", "ios", "App", "App", "Assets.xcassets", "Splash.imageset")
+]
+
+@dataclass
+class SplashResult:
+    """Outcome of building one splash file"""
+    
+    path: str
+    status: str  # "written", "unchanged" or "failed"
+    bytes: int = 0
+    error: str = None
+    budget: int = None
+    
+    @property
+    def over_budget(self):
+        return self.budget is not None and self.bytes > self.budget
+
+def splash_shapes(icon_size, origin, shadow_offset, design=ICON_DESIGN):
+    """Icon shapes placed on the splash canvas, snapped to whole pixels
+    
+    Pillow rasterizes fractional corners relative to wherever the shape
+    lands, so a shape drawn at a fractional position (or with a fractional
+    corner diameter) can come out a pixel different from strip to strip.
+    Rounding boxes and diameters once relative to the icon, then moving by
+    whole pixels, gives every strip the same edges as a single-pass render.
+    """
+    
+    origin_x, origin_y = origin
+    return [
+        (
+            tuple(round(value) + offset for value, offset in zip(box, (origin_x, origin_y) * 2)),
+            round(radius * 2) / 2,
+            fill
+        )
+        for box, radius, fill in book_stack_shapes(icon_size, shadow_offset, design)
+    ]
+
+def splash_strips(size, background, supersample=SPLASH_SUPERSAMPLE,
+                  strip_pixels=SPLASH_STRIP_PIXELS, design=ICON_DESIGN):
+    """Yield the splash image as (rows, size, 3) uint8 strips, top to bottom
+    
+    Each strip is drawn at supersample resolution and box-reduced, so the
+    icon edges are anti-aliased. Strips that miss the icon are a flat fill
+    built once and reused.
+    """
+    
+    icon_size = round(size * SPLASH_ICON_FRACTION)
+    icon_x = (size - icon_size) // 2
+    icon_y = (size - icon_size) // 2
+    shadow_offset = 2 * icon_size / MASTER_SIZE
+    shapes = splash_shapes(
+        icon_size * supersample,
+        (icon_x * supersample, icon_y * supersample),
+        shadow_offset * supersample,
+        design
+    )
+    
+    strip_rows = max(1, strip_pixels // size)
+    
+    blank = None
+    for top in range(0, size, strip_rows):
+        rows = min(strip_rows, size - top)
+        
+        # Shadows extend a little past the icon square, so pad the test
+        if top + rows <= icon_y - 1 or top >= icon_y + icon_size + 1:
+            if blank is None or len(blank) != rows:
+                blank = np.empty((rows, size, 3), dtype=np.uint8)
+                blank[:] = background
+            yield blank
+            continue
+        
+        # Drawing in RGBA mode onto an opaque strip blends the translucent
+        # shadow and highlight over what is beneath them
+        strip = Image.new("RGB", (size * supersample, rows * supersample), tuple(background))
+        draw = ImageDraw.Draw(strip, "RGBA")
+        shift = top * supersample
+        for (x0, y0, x1, y1), radius, fill in shapes:
+            draw.rounded_rectangle([(x0, y0 - shift), (x1, y1 - shift)], radius=radius, fill=fill)
+        yield np.asarray(strip.reduce(supersample))
+
+def splash_palette(size, background, supersample=SPLASH_SUPERSAMPLE, design=ICON_DESIGN):
+    """Sorted packed RGB colors of the splash, or None if over 256
+    
+    Found with a streaming pass over the strips so the palette is known
+    before any pixel is written.
+    """
+    
+    colors = np.empty(0, dtype=np.uint32)
+    for strip in splash_strips(size, background, supersample, design=design):
+        colors = np.union1d(colors, np.unique(pack_rgb(strip)))
+        if len(colors) > 256:
+            return None
+    return colors
+
+def pack_rgb(pixels):
+    pixels = pixels.astype(np.uint32)
+    return (pixels[..., 0] << 16) | (pixels[..., 1] << 8) | pixels[..., 2]
+
+def write_splash(f, size, background, supersample=SPLASH_SUPERSAMPLE, design=ICON_DESIGN):
+    """Stream one splash image to a binary file object
+    
+    Uses an exact palette when the image has at most 256 colors (the usual
+    case for the flat design), otherwise 8-bit RGB.
+    """
+    
+    colors = splash_palette(size, background, supersample, design)
+    
+    if colors is None:
+        with PngStreamWriter(f, size, size, "RGB") as writer:
+            for strip in splash_strips(size, background, supersample, design=design):
+                writer.write_rows(strip)
+        return
+    
+    palette = np.stack([(colors >> 16) & 0xFF, (colors >> 8) & 0xFF, colors & 0xFF], axis=1)
+    with PngStreamWriter(f, size, size, "P", palette=palette) as writer:
+        for strip in splash_strips(size, background, supersample, design=design):
+            writer.write_rows(np.searchsorted(colors, pack_rgb(strip)).astype(np.uint8))
+
+def splash_key(size, variant, supersample, design=ICON_DESIGN):
+    """Hash of every input that determines a splash variant"""
+    
+    params = {
+        "version": GENERATOR_VERSION,
+        "splash_version": SPLASH_VERSION,
+        "design": design,
+        "icon_fraction": SPLASH_ICON_FRACTION,
+        "background": variant["background"],
+        "supersample": supersample,
+        "size": size
+    }
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()
+
+def splash_contents(variants):
+    """Single-scale Splash.imageset Contents.json with one entry per variant"""
+    
+    images = []
+    for variant in variants:
+        image = {"idiom": "universal", "filename": variant["filename"]}
+        if variant["appearance"]:
+            image["appearances"] = [{"appearance": "luminosity", "value": variant["appearance"]}]
+        images.append(image)
+    
+    return {"images": images, "info": {"author": "xcode", "version": 1}}
+
+def update_contents(dir_path, variants):
+    """Rewrite Contents.json and remove image files it no longer references"""
+    
+    contents_path = os.path.join(dir_path, "Contents.json")
+    old_files = set()
+    if os.path.exists(contents_path):
+        with open(contents_path) as f:
+            old_files = {image["filename"] for image in json.load(f).get("images", []) if "filename" in image}
+    
+    data = json.dumps(splash_contents(variants), indent=2) + "\n"
+    current = None
+    if os.path.exists(contents_path):
+        with open(contents_path) as f:
+            current = f.read()
+    if current != data:
+        with open(contents_path, "w") as f:
+            f.write(data)
+    
+    for filename in old_files - {variant["filename"] for variant in variants}:
+        path = os.path.join(dir_path, filename)
+        if os.path.exists(path):
+            os.remove(path)
+
+def create_splash_screens(output_dirs=SPLASH_TARGETS, size=SPLASH_SIZE, variants=SPLASH_VARIANTS,
+                          supersample=SPLASH_SUPERSAMPLE, force=False, design=ICON_DESIGN):
+    """Create every splash variant in each target and return a SplashResult per file
+    
+    Each variant is rendered once, then linked or copied into the other
+    targets; unchanged variants are skipped using a manifest like the icons.
+    Results carry the byte budget for the splash size (see budget.byte_budget).
+    """
+    
+    variants = [dict(variant, filename=variant["filename"].format(size=size)) for variant in variants]
+    budget = byte_budget(size, size)
+    
+    for dir_path in output_dirs:
+        os.makedirs(dir_path, exist_ok=True)
+    
+    manifests = {dir_path: load_manifest(dir_path, SPLASH_MANIFEST_FILENAME) for dir_path in output_dirs}
+    results = []
+    
+    for variant in variants:
+        filename = variant["filename"]
+        key = splash_key(size, variant, supersample, design)
+        
+        stale = force or any(
+            manifests[dir_path].get(filename, {}).get("key") != key
+            or file_digest(os.path.join(dir_path, filename)) != manifests[dir_path][filename].get("sha256")
+            for dir_path in output_dirs
+        )
+        
+        if not stale:
+            for dir_path in output_dirs:
+                entry = manifests[dir_path][filename]
+                results.append(SplashResult(os.path.join(dir_path, filename), "unchanged", entry.get("bytes", 0), budget=budget))
+            continue
+        
+        # Stream into the first target, then link or copy it into the rest
+        first_path = os.path.join(output_dirs[0], filename)
+        tmp_path = first_path + ".tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                write_splash(f, size, variant["background"], supersample, design)
+            if file_digest(tmp_path) == file_digest(first_path):
+                os.remove(tmp_path)
+                first_status = "unchanged"
+            else:
+                os.replace(tmp_path, first_path)
+                first_status = "written"
+        except Exception as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            for dir_path in output_dirs:
+                results.append(SplashResult(os.path.join(dir_path, filename), "failed", error=repr(e)))
+            continue
+        
+        digest = file_digest(first_path)
+        nbytes = os.path.getsize(first_path)
+        
+        for dir_path in output_dirs:
+            output_path = os.path.join(dir_path, filename)
+            status = first_status
+            if output_path != first_path:
+                try:
+                    status = "written" if write_output(None, digest, output_path, first_path) else "unchanged"
+                except OSError as e:
+                    results.append(SplashResult(output_path, "failed", error=repr(e)))
+                    continue
+            results.append(SplashResult(output_path, status, nbytes, budget=budget))
+            manifests[dir_path][filename] = {"key": key, "sha256": digest, "bytes": nbytes}
+    
+    filenames = {variant["filename"] for variant in variants}
+    for dir_path in output_dirs:
+        update_contents(dir_path, variants)
+        outputs = {name: entry for name, entry in manifests[dir_path].items() if name in filenames}
+        save_manifest(dir_path, outputs, SPLASH_MANIFEST_FILENAME)
+    
+    return results
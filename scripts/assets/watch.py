@@ -0,0 +1,171 @@
+"""Warm watch mode for iterating on the icon design
+
+Keeps Pillow, the encoder and the interpreter loaded and polls the design
+spec file (icon-design.json). On every change it redraws the master icon
+and writes fast-compressed 1024px and 20px previews, which takes a few tens
+of milliseconds, then optionally brings the appiconsets up to date,
+encoding only the pixel sizes whose pixels actually changed, straight
+from the same in-memory pyramid.
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+from PIL import Image
+
+from .icons import (
+    DEFAULT_SUPERSAMPLE, DESIGN_PATH, PREVIEW_DIR,
+    ICON_TARGETS, build_icon_pyramid, create_all_ios_icons, ensure_contents, load_design,
+    load_icon_specs, render_master_icon
+)
+
+PREVIEW_SIZES = [1024, 20]
+# Nearest-neighbour zoom for the 20px preview so single pixels are visible
+PREVIEW_ZOOM = 8
+
+# Seconds between checks of the spec file
+POLL_INTERVAL = 0.1
+
+# Background the terminal preview composites the icon corners onto
+TERMINAL_BACKGROUND = (40, 40, 40)
+
+def terminal_preview(img, background=TERMINAL_BACKGROUND):
+    """Lines of ANSI true-color half blocks showing a small RGBA image
+    
+    Each character cell shows two pixel rows: the upper one as the
+    foreground of "▀" and the lower one as the background.
+    """
+    
+    canvas = Image.new("RGBA", img.size, background + (255,))
+    pixels = np.asarray(Image.alpha_composite(canvas, img.convert("RGBA")).convert("RGB"))
+    if len(pixels) % 2:
+        pixels = np.concatenate([pixels, np.full_like(pixels[:1], background)])
+    
+    lines = []
+    for upper, lower in zip(pixels[0::2], pixels[1::2]):
+        cells = "".join(
+            "\x1b[38;2;%d;%d;%dm\x1b[48;2;%d;%d;%dm▀" % (*top, *bottom)
+            for top, bottom in zip(upper, lower)
+        )
+        lines.append(cells + "\x1b[0m")
+    return lines
+
+def write_previews(pyramid, preview_dir=PREVIEW_DIR):
+    """Save the preview sizes from a pyramid; returns the paths written"""
+    
+    os.makedirs(preview_dir, exist_ok=True)
+    paths = []
+    for size in PREVIEW_SIZES:
+        path = os.path.join(preview_dir, f"icon-{size}.png")
+        # Previews favour speed over size; the real icons go through encode.py
+        pyramid[size].save(path, compress_level=1)
+        paths.append(path)
+    
+    small = pyramid[min(PREVIEW_SIZES)]
+    zoom_path = os.path.join(preview_dir, f"icon-{small.width}-zoom.png")
+    small.resize((small.width * PREVIEW_ZOOM, small.height * PREVIEW_ZOOM), Image.NEAREST).save(zoom_path, compress_level=1)
+    paths.append(zoom_path)
+    
+    return paths
+
+def changed_sizes(pyramid, previous):
+    """Pixel sizes whose rendering differs from the previous pyramid"""
+    
+    return sorted(
+        size for size, img in pyramid.items()
+        if size not in previous or img.tobytes() != previous[size].tobytes()
+    )
+
+def rebuild(design, output_dirs, previous, preview_dir=PREVIEW_DIR,
+            supersample=DEFAULT_SUPERSAMPLE, jobs=None, terminal=False,
+            contents_template=ICON_TARGETS[0]):
+    """Preview one design and optionally update the targets; returns its pyramid
+    
+    Targets without a Contents.json get a copy of contents_template's, as
+    with the icons command.
+    """
+    
+    start = time.perf_counter()
+    sizes = set(PREVIEW_SIZES)
+    for dir_path in output_dirs:
+        ensure_contents(dir_path, contents_template)
+        sizes.update(size for size, _ in load_icon_specs(dir_path))
+    pyramid = build_icon_pyramid(render_master_icon(supersample, design), sizes)
+    paths = write_previews(pyramid, preview_dir)
+    elapsed = time.perf_counter() - start
+    
+    print(f"🎨 Preview ready in {elapsed * 1000:.0f}ms: {', '.join(os.path.relpath(path) for path in paths)}")
+    if terminal:
+        for line in terminal_preview(pyramid[min(PREVIEW_SIZES)]):
+            print(f"   {line}")
+    
+    if output_dirs:
+        changed = changed_sizes(pyramid, previous)
+        if not changed:
+            print("  ✨ No icon pixels changed")
+            return pyramid
+        
+        start = time.perf_counter()
+        # On the first pass every size is "changed"; let the manifests decide.
+        # Stale sizes are encoded straight from this pyramid, not re-rendered
+        only = [str(size) for size in changed] if previous else None
+        results = create_all_ios_icons(
+            output_dirs, supersample=supersample, jobs=jobs, only=only, design=design,
+            contents_template=contents_template, pyramid=pyramid
+        )
+        elapsed = time.perf_counter() - start
+        
+        written = sum(1 for result in results if result.status == "written")
+        failed = [result for result in results if result.status == "failed"]
+        for result in failed:
+            print(f"  ❌ {os.path.relpath(result.path)}: {result.error}")
+        print(f"  ✅ {written} written, {len(results) - written - len(failed)} unchanged ({elapsed:.2f}s)")
+    
+    return pyramid
+
+def watch_design(design_path=DESIGN_PATH, output_dirs=(), preview_dir=PREVIEW_DIR,
+                 supersample=DEFAULT_SUPERSAMPLE, jobs=None, interval=POLL_INTERVAL,
+                 once=False, terminal=None, contents_template=ICON_TARGETS[0]):
+    """Rebuild previews (and targets) whenever the design spec changes
+    
+    Invalid or half-written spec files are reported and skipped, as are
+    builds that fail on a target; the loop tries again on the next
+    modification of the spec. Returns after the first build when once is
+    true.
+    """
+    
+    if terminal is None:
+        terminal = sys.stdout.isatty()
+    
+    last_mtime = None
+    last_design = None
+    previous = {}
+    
+    while True:
+        try:
+            mtime = os.stat(design_path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        
+        if mtime != last_mtime:
+            last_mtime = mtime
+            try:
+                design = load_design(design_path)
+            except (OSError, ValueError) as e:
+                print(f"  ❌ {os.path.relpath(design_path)}: {e}")
+                design = None
+            
+            if design is not None and design != last_design:
+                last_design = design
+                try:
+                    previous = rebuild(
+                        design, output_dirs, previous, preview_dir, supersample, jobs, terminal, contents_template
+                    )
+                except OSError as e:
+                    print(f"  ❌ {e}")
+        
+        if once:
+            return
+        time.sleep(interval)
@@ -3,6 +3,11 @@
 # Create iOS App Icons for Stacks - Library Book Discovery App
 # This script creates all required iOS app icon sizes
 
+# ImageMagick fallback for machines without Pillow. The design's source of
+# truth is scripts/assets/icon-design.json (used by python -m scripts.assets
+# icons/watch and scripts/generate-ios-icons.js); keep these colors in step
+# with it when the design changes.
+
 # Colors for the book stack design
 BACKGROUND_COLOR="#1e40af"
 BOOK1_COLOR="#f59e0b"  # Orange
@@ -3,13 +3,20 @@
 const fs = require('fs');
 const path = require('path');
 
+// Design parameters shared with the Python generator (python -m scripts.assets icons/watch)
+const design = JSON.parse(fs.readFileSync(path.join(__dirname, 'assets', 'icon-design.json'), 'utf8'));
+
+const hex = ([r, g, b]) => '#' + [r, g, b].map((c) => c.toString(16).padStart(2, '0')).join('');
+const [book1Color, book2Color, book3Color, book4Color] = design.book_colors.map(hex);
+
 // SVG template for the book stack icon
 function createBookStackSVG(size) {
   const scale = size / 1024; // Scale everything relative to 1024px base
-  const padding = size * 0.12; // 12% padding
-  const bookWidth = (size - 2 * padding) * 0.8;
-  const bookHeight = bookWidth * 0.15;
-  const stackHeight = bookHeight * 4.5;
+  const padding = size * design.padding;
+  const bookWidth = (size - 2 * padding) * design.book_width;
+  const bookHeight = bookWidth * design.book_height;
+  const stackHeight = bookHeight * design.stack_height;
+  const bookRadius = bookHeight * design.book_radius;
 
   // Center the stack
   const centerX = size / 2;
@@ -17,26 +24,36 @@ function createBookStackSVG(size) {
   const stackX = centerX - bookWidth / 2;
   const stackY = centerY - stackHeight / 2;
 
+  // Books from bottom to top, placed exactly as draw_book_stack in scripts/assets/icons.py
+  // (book_colors lists the top book first, so the bottom book uses the last gradient)
+  const books = design.book_offsets.map((offset, i) => ({
+    x: stackX + bookWidth * offset,
+    y: stackY + stackHeight - bookHeight * (i + 1.1),
+    width: bookWidth * design.book_widths[i],
+    gradient: `book${design.book_colors.length - i}`,
+  }));
+  const top = books[books.length - 1];
+
   return `<svg width="${size}" height="${size}" viewBox="0 0 ${size} ${size}" xmlns="http://www.w3.org/2000/svg">
   <defs>
     <linearGradient id="bg" x1="0%" y1="0%" x2="100%" y2="100%">
-      <stop offset="0%" style="stop-color:#1e40af;stop-opacity:1" />
+      <stop offset="0%" style="stop-color:${hex(design.bg_color)};stop-opacity:1" />
       <stop offset="100%" style="stop-color:#0369a1;stop-opacity:1" />
     </linearGradient>
     <linearGradient id="book1" x1="0%" y1="0%" x2="100%" y2="100%">
-      <stop offset="0%" style="stop-color:#f59e0b;stop-opacity:1" />
+      <stop offset="0%" style="stop-color:${book1Color};stop-opacity:1" />
       <stop offset="100%" style="stop-color:#d97706;stop-opacity:1" />
     </linearGradient>
     <linearGradient id="book2" x1="0%" y1="0%" x2="100%" y2="100%">
-      <stop offset="0%" style="stop-color:#10b981;stop-opacity:1" />
+      <stop offset="0%" style="stop-color:${book2Color};stop-opacity:1" />
       <stop offset="100%" style="stop-color:#059669;stop-opacity:1" />
     </linearGradient>
     <linearGradient id="book3" x1="0%" y1="0%" x2="100%" y2="100%">
-      <stop offset="0%" style="stop-color:#ef4444;stop-opacity:1" />
+      <stop offset="0%" style="stop-color:${book3Color};stop-opacity:1" />
       <stop offset="100%" style="stop-color:#dc2626;stop-opacity:1" />
     </linearGradient>
     <linearGradient id="book4" x1="0%" y1="0%" x2="100%" y2="100%">
-      <stop offset="0%" style="stop-color:#8b5cf6;stop-opacity:1" />
+      <stop offset="0%" style="stop-color:${book4Color};stop-opacity:1" />
       <stop offset="100%" style="stop-color:#7c3aed;stop-opacity:1" />
     </linearGradient>
     <filter id="shadow" x="-50%" y="-50%" width="200%" height="200%">
@@ -45,25 +62,15 @@ function createBookStackSVG(size) {
   </defs>
   
   <!-- Background -->
-  <rect width="${size}" height="${size}" fill="url(#bg)" rx="${size * 0.22}" ry="${size * 0.22}"/>
+  <rect width="${size}" height="${size}" fill="url(#bg)" rx="${size * design.corner_radius}" ry="${size * design.corner_radius}"/>
   
   <!-- Book Stack -->
   <g filter="url(#shadow)">
-    <!-- Bottom book (purple) -->
-    <rect x="${stackX}" y="${stackY + stackHeight - bookHeight}" width="${bookWidth}" height="${bookHeight}" fill="url(#book4)" rx="${bookHeight * 0.1}" ry="${bookHeight * 0.1}"/>
-    
-    <!-- Third book (red) - slightly offset -->
-    <rect x="${stackX + bookWidth * 0.05}" y="${stackY + stackHeight - bookHeight * 2.1}" width="${bookWidth * 0.9}" height="${bookHeight}" fill="url(#book3)" rx="${bookHeight * 0.1}" ry="${bookHeight * 0.1}"/>
-    
-    <!-- Second book (green) -->
-    <rect x="${stackX}" y="${stackY + stackHeight - bookHeight * 3.2}" width="${bookWidth}" height="${bookHeight}" fill="url(#book2)" rx="${bookHeight * 0.1}" ry="${bookHeight * 0.1}"/>
-    
-    <!-- Top book (orange) - slightly offset -->
-    <rect x="${stackX + bookWidth * 0.08}" y="${stackY + stackHeight - bookHeight * 4.3}" width="${bookWidth * 0.85}" height="${bookHeight}" fill="url(#book1)" rx="${bookHeight * 0.1}" ry="${bookHeight * 0.1}"/>
+${books.map(({ x, y, width, gradient }) => `    <rect x="${x}" y="${y}" width="${width}" height="${bookHeight}" fill="url(#${gradient})" rx="${bookRadius}" ry="${bookRadius}"/>`).join('\n')}
   </g>
   
   <!-- Subtle highlight on top book -->
-  <rect x="${stackX + bookWidth * 0.08}" y="${stackY + stackHeight - bookHeight * 4.3}" width="${bookWidth * 0.85}" height="${bookHeight * 0.3}" fill="rgba(255,255,255,0.2)" rx="${bookHeight * 0.1}" ry="${bookHeight * 0.1}"/>
+  <rect x="${top.x}" y="${top.y}" width="${top.width}" height="${bookHeight * design.highlight_height}" fill="rgba(255,255,255,0.2)" rx="${bookRadius}" ry="${bookRadius}"/>
 </svg>`;
 }
 
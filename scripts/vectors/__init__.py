@@ -0,0 +1,7 @@
+"""Local, memory-mapped stand-in for the book_embeddings similarity search
+
+Run from the repository root with:
+
+    python -m scripts.vectors build --from-ts lib/data/mockBooks.ts
+    python -m scripts.vectors serve
+"""
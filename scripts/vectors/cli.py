@@ -0,0 +1,275 @@
+"""Command line entry point for the local vector index"""
+
+import os
+import json
+import time
+import argparse
+import tempfile
+
+def embed_books(books, dim, batch=4096):
+    """Embed book rows into a temporary float32 memory map, batch by batch"""
+    
+    from .embedding import book_text, embed_texts
+    import numpy as np
+    
+    tmp = tempfile.NamedTemporaryFile(suffix=".f32", delete=False)
+    tmp.close()
+    vectors = np.memmap(tmp.name, dtype=np.float32, mode="w+", shape=(len(books), dim))
+    for start in range(0, len(books), batch):
+        chunk = books[start:start + batch]
+        vectors[start:start + len(chunk)] = embed_texts([book_text(book) for book in chunk], dim)
+    return vectors, tmp.name
+
+# Query perturbation relative to a unit catalog row in the benchmark
+QUERY_NOISE = 0.5
+
+def default_nlist(count):
+    """About sqrt(count) lists, the usual IVF starting point"""
+    
+    return max(1, round(count ** 0.5))
+
+def run_build(args):
+    from .sources import load_jsonl_books, load_ts_books
+    from .store import build_index
+    
+    books = []
+    for path in args.from_ts or []:
+        books.extend(load_ts_books(path, args.export))
+    for path in args.jsonl or []:
+        books.extend(load_jsonl_books(path))
+    
+    if not books:
+        print("❌ No books to index; pass --from-ts or --jsonl")
+        return 1
+    
+    print(f"📚 Indexing {len(books)} books into {os.path.relpath(args.out)}...")
+    
+    start = time.perf_counter()
+    vectors, tmp_path = embed_books(books, args.dim)
+    try:
+        nlist = (args.nlist or default_nlist(len(books))) if args.ivf else 0
+        index = build_index(args.out, vectors, books, args.dtype, nlist)
+    finally:
+        del vectors
+        os.remove(tmp_path)
+    elapsed = time.perf_counter() - start
+    
+    lists = f", {index.meta['nlist']} IVF lists" if index.meta["nlist"] else ""
+    print(f"🎉 {index.count} vectors ({args.dtype}{lists}) in {elapsed:.2f}s")
+    return 0
+
+def run_query(args):
+    from .server import match_books
+    from .store import VectorIndex
+    
+    index = VectorIndex(args.index)
+    payload = {"queries": args.text, "match_count": args.count, "match_threshold": args.threshold}
+    
+    start = time.perf_counter()
+    results = match_books(index, payload, args.nprobe)
+    elapsed = time.perf_counter() - start
+    
+    for text, matches in zip(args.text, results):
+        print(f"🔎 {text}")
+        for match in matches:
+            print(f"  {match['similarity']:.3f}  {match['title']} — {match['author']} ({match['id']})")
+        print("")
+    
+    print(f"✨ {len(args.text)} queries in {elapsed * 1000:.1f}ms")
+    return 0
+
+def run_serve(args):
+    from .server import serve
+    from .store import VectorIndex
+    
+    index = VectorIndex(args.index)
+    print(f"🚀 Serving {index.count} books on http://{args.host}:{args.port}/match_books")
+    serve(index, args.host, args.port, args.nprobe)
+    return 0
+
+def synthetic_catalog(path, count, dim, clusters, spread=1.0, seed=0, batch=8192):
+    """Clustered unit vectors written to a float32 memory map
+    
+    Each row is a random cluster center plus Gaussian noise spread times
+    its size, which gives the skewed neighbourhood structure IVF relies on
+    in real embedding sets; larger spreads blur the clusters together.
+    """
+    
+    import numpy as np
+    from .embedding import normalize
+    
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim), dtype=np.float32)
+    vectors = np.memmap(path, dtype=np.float32, mode="w+", shape=(count, dim))
+    for start in range(0, count, batch):
+        rows = min(batch, count - start)
+        noise = rng.standard_normal((rows, dim), dtype=np.float32)
+        vectors[start:start + rows] = normalize(centers[rng.integers(clusters, size=rows)] + spread * noise)
+    vectors.flush()
+    return vectors
+
+def latency_stats(timings):
+    import numpy as np
+    
+    timings = np.asarray(timings) * 1000
+    return np.percentile(timings, 50), np.percentile(timings, 95)
+
+def run_bench(args):
+    import numpy as np
+    from .embedding import normalize
+    from .store import build_index
+    
+    nlist = args.nlist or default_nlist(args.count)
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        print(f"🧪 Building {args.count} x {args.dim} synthetic catalog ({args.dtype}, {nlist} IVF lists)...")
+        start = time.perf_counter()
+        source = synthetic_catalog(os.path.join(tmp_dir, "source.f32"), args.count, args.dim, args.clusters, args.spread)
+        books = [{"id": str(row)} for row in range(args.count)]
+        index = build_index(os.path.join(tmp_dir, "index"), source, books, args.dtype, nlist)
+        print(f"  built in {time.perf_counter() - start:.1f}s")
+        
+        # Queries are perturbed catalog rows, like a search close to real books
+        rng = np.random.default_rng(1)
+        picks = np.sort(rng.choice(args.count, args.queries, replace=False))
+        noise = rng.standard_normal((args.queries, args.dim), dtype=np.float32) / np.sqrt(args.dim)
+        queries = normalize(np.asarray(source[picks]) + QUERY_NOISE * noise)
+        del source
+        
+        def measure(nprobe):
+            timings = []
+            rows = []
+            for start in range(0, args.queries, args.batch):
+                began = time.perf_counter()
+                _, batch_rows = index.search(queries[start:start + args.batch], args.k, nprobe)
+                timings.append(time.perf_counter() - began)
+                rows.append(batch_rows)
+            return timings, np.concatenate(rows)
+        
+        timings, truth = measure(None)
+        p50, p95 = latency_stats(timings)
+        report = {"brute": {"p50Ms": p50, "p95Ms": p95, "recall": 1.0}}
+        print("")
+        print(f"  {'mode':<12} {'p50 ms':>9} {'p95 ms':>9} {f'recall@{args.k}':>10}")
+        print(f"  {'brute':<12} {p50:9.2f} {p95:9.2f} {1.0:10.3f}")
+        
+        for nprobe in args.nprobe:
+            timings, rows = measure(nprobe)
+            p50, p95 = latency_stats(timings)
+            recall = np.mean([len(np.intersect1d(a, b)) / args.k for a, b in zip(rows, truth)])
+            report[f"ivf{nprobe}"] = {"p50Ms": p50, "p95Ms": p95, "recall": recall}
+            print(f"  {f'ivf nprobe={nprobe}':<12} {p50:9.2f} {p95:9.2f} {recall:10.3f}")
+        
+        del index
+    
+    print("")
+    print(f"✨ Latency is per batch of {args.batch} queries")
+    
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({name: {key: round(float(value), 4) for key, value in row.items()} for name, row in report.items()}, f, indent=2)
+            f.write("\n")
+    return 0
+
+def build_parser():
+    from .embedding import EMBEDDING_DIM
+    from .store import INDEX_DIR
+    
+    parser = argparse.ArgumentParser(prog="python -m scripts.vectors", description="Local book similarity index")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    build = subparsers.add_parser("build", help="embed books and write a memory-mapped index")
+    build.add_argument(
+        "--from-ts",
+        action="append",
+        metavar="PATH",
+        help="load books from an exported array in a lib/data/*.ts file (repeatable)"
+    )
+    build.add_argument(
+        "--export",
+        default="mockBooksWithMetadata",
+        help="exported array to read from --from-ts files (default: %(default)s)"
+    )
+    build.add_argument(
+        "--jsonl",
+        action="append",
+        metavar="PATH",
+        help="load books from a JSONL dump, one book per line (repeatable)"
+    )
+    build.add_argument(
+        "--out",
+        default=INDEX_DIR,
+        metavar="DIR",
+        help="index directory (default: .vector-index)"
+    )
+    build.add_argument(
+        "--dtype",
+        choices=["float32", "float16"],
+        default="float32",
+        help="stored vector precision (default: %(default)s)"
+    )
+    build.add_argument(
+        "--dim",
+        type=int,
+        default=EMBEDDING_DIM,
+        help="embedding dimensions (default: %(default)s, matching book_embeddings)"
+    )
+    build.add_argument(
+        "--ivf",
+        action="store_true",
+        help="partition rows into IVF lists for approximate search"
+    )
+    build.add_argument(
+        "--nlist",
+        type=int,
+        default=None,
+        help="number of IVF lists (default: about sqrt of the book count)"
+    )
+    build.set_defaults(handler=run_build)
+    
+    query = subparsers.add_parser("query", help="search the index from the command line")
+    query.add_argument("text", nargs="+", help="query text (several are searched as one batch)")
+    query.add_argument("--index", default=INDEX_DIR, metavar="DIR", help="index directory (default: .vector-index)")
+    query.add_argument("--count", type=int, default=10, help="matches per query (default: %(default)s)")
+    query.add_argument("--threshold", type=float, default=0.0, help="minimum similarity (default: %(default)s)")
+    query.add_argument("--nprobe", type=int, default=None, help="IVF lists to probe (default: exact search)")
+    query.set_defaults(handler=run_query)
+    
+    serve = subparsers.add_parser("serve", help="answer match_books requests over HTTP")
+    serve.add_argument("--index", default=INDEX_DIR, metavar="DIR", help="index directory (default: .vector-index)")
+    serve.add_argument("--host", default="127.0.0.1", help="address to bind (default: %(default)s)")
+    serve.add_argument("--port", type=int, default=8765, help="port to listen on (default: %(default)s)")
+    serve.add_argument(
+        "--nprobe",
+        type=int,
+        default=None,
+        help="IVF lists to probe when a request does not say (default: exact search)"
+    )
+    serve.set_defaults(handler=run_serve)
+    
+    bench = subparsers.add_parser("bench", help="compare brute-force and IVF latency and recall on synthetic data")
+    bench.add_argument("--count", type=int, default=100_000, help="catalog size (default: %(default)s)")
+    bench.add_argument("--dim", type=int, default=EMBEDDING_DIM, help="dimensions (default: %(default)s)")
+    bench.add_argument("--clusters", type=int, default=1000, help="synthetic topic clusters (default: %(default)s)")
+    bench.add_argument("--spread", type=float, default=2.0, help="within-cluster noise relative to the cluster center (default: %(default)s)")
+    bench.add_argument("--dtype", choices=["float32", "float16"], default="float32")
+    bench.add_argument("--nlist", type=int, default=None, help="IVF lists (default: about sqrt of --count)")
+    bench.add_argument(
+        "--nprobe",
+        type=int,
+        action="append",
+        help="IVF lists to probe (repeatable, default: 4, 16 and 64)"
+    )
+    bench.add_argument("--queries", type=int, default=256, help="queries to run (default: %(default)s)")
+    bench.add_argument("--batch", type=int, default=1, help="queries per search call (default: %(default)s)")
+    bench.add_argument("-k", type=int, default=10, help="neighbours per query (default: %(default)s)")
+    bench.add_argument("--json", metavar="PATH", help="also write the results as JSON")
+    bench.set_defaults(handler=run_bench)
+    
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == "bench" and not args.nprobe:
+        args.nprobe = [4, 16, 64]
+    return args.handler(args)
@@ -0,0 +1,57 @@
+"""Deterministic local embeddings for books and queries
+
+Signed feature hashing of word unigrams and bigrams into the same 1536
+dimensions as book_embeddings.embedding. It captures lexical overlap only,
+which is enough to exercise the search path, measure latency and compare
+recall without an embedding API.
+"""
+
+import re
+import zlib
+
+import numpy as np
+
+EMBEDDING_DIM = 1536
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9+']+")
+
+def tokenize(text):
+    """Lowercased word unigrams plus adjacent-word bigrams"""
+    
+    words = TOKEN_PATTERN.findall(text.lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+def embed_texts(texts, dim=EMBEDDING_DIM):
+    """Embed texts into an (n, dim) float32 array of unit vectors
+    
+    Each token hashes (CRC-32) to a bucket and a sign; all tokens of all
+    texts are scattered into the matrix with a single np.add.at.
+    """
+    
+    rows, hashes = [], []
+    for row, text in enumerate(texts):
+        for token in tokenize(text):
+            rows.append(row)
+            hashes.append(zlib.crc32(token.encode()))
+    
+    vectors = np.zeros((len(texts), dim), dtype=np.float32)
+    if hashes:
+        hashes = np.asarray(hashes, dtype=np.uint32)
+        signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+        np.add.at(vectors, (np.asarray(rows), (hashes & 0x7FFFFFFF) % dim), signs)
+    
+    return normalize(vectors)
+
+def normalize(vectors):
+    """Scale rows to unit length (zero rows stay zero)"""
+    
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+def book_text(book):
+    """Text that represents a book in the index"""
+    
+    parts = [book.get("title", ""), book.get("author", ""), book.get("description", "")]
+    parts.extend(book.get("genres", []))
+    parts.extend(book.get("tags", []))
+    return " ".join(part for part in parts if part)
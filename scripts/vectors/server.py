@@ -0,0 +1,152 @@
+"""Small HTTP service answering match_books queries from a local index
+
+POST /match_books takes the arguments of the Supabase match_books RPC
+(query_embedding, match_threshold, match_count) and also accepts a plain
+text query, which is embedded locally. Several queries can be sent at once
+as "queries" (texts) or "query_embeddings" and are scored in one batch.
+The response rows have the RPC's columns: id, title, author, description,
+cover_url and similarity.
+
+GET /health reports the loaded index.
+"""
+
+import json
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from .embedding import embed_texts
+
+# The local embeddings score lexical overlap, which runs well below the
+# 0.7 the RPC defaults to for semantic embeddings
+DEFAULT_MATCH_THRESHOLD = 0.0
+DEFAULT_MATCH_COUNT = 10
+MAX_MATCH_COUNT = 1000
+
+MATCH_COLUMNS = ("id", "title", "author", "description", "cover_url")
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def is_positive_int(value):
+    return isinstance(value, int) and not isinstance(value, bool) and value > 0
+
+def is_vector(value):
+    return isinstance(value, list) and all(is_number(item) for item in value)
+
+def payload_option(payload, name, default, valid, expected):
+    """payload[name] (or default when missing), raising ValueError if not valid"""
+    
+    value = payload.get(name)
+    if value is None:
+        return default
+    if not valid(value):
+        raise ValueError(f"{name} must be {expected}")
+    return value
+
+def match_books(index, payload, nprobe=None):
+    """Answer one request body; returns a list of match lists, one per query
+    
+    Raises ValueError for malformed payloads.
+    """
+    
+    if not isinstance(payload, dict):
+        raise ValueError("Expected a JSON object")
+    
+    if "query_embeddings" in payload:
+        embeddings = payload["query_embeddings"]
+        if not isinstance(embeddings, list) or not embeddings or not all(is_vector(row) for row in embeddings):
+            raise ValueError("query_embeddings must be a non-empty list of number lists")
+        queries = np.asarray(embeddings, dtype=np.float32)
+    elif "query_embedding" in payload:
+        if not is_vector(payload["query_embedding"]):
+            raise ValueError("query_embedding must be a list of numbers")
+        queries = np.asarray([payload["query_embedding"]], dtype=np.float32)
+    elif "queries" in payload:
+        texts = payload["queries"]
+        if not isinstance(texts, list) or not texts or not all(isinstance(text, str) for text in texts):
+            raise ValueError("queries must be a non-empty list of strings")
+        queries = embed_texts(texts, index.dim)
+    elif "query" in payload:
+        if not isinstance(payload["query"], str):
+            raise ValueError("query must be a string")
+        queries = embed_texts([payload["query"]], index.dim)
+    else:
+        raise ValueError("Expected query, queries, query_embedding or query_embeddings")
+    
+    if queries.ndim != 2 or queries.shape[1] != index.dim:
+        raise ValueError(f"Query embeddings must have {index.dim} dimensions")
+    
+    threshold = float(payload_option(payload, "match_threshold", DEFAULT_MATCH_THRESHOLD, is_number, "a number"))
+    count = min(payload_option(payload, "match_count", DEFAULT_MATCH_COUNT, is_positive_int, "a positive integer"), MAX_MATCH_COUNT)
+    nprobe = payload_option(payload, "nprobe", nprobe, is_positive_int, "a positive integer")
+    
+    scores, rows = index.search(queries, count, nprobe)
+    books = index.books
+    
+    return [
+        [
+            dict({column: books[row].get(column, "") for column in MATCH_COLUMNS}, similarity=round(float(score), 6))
+            for score, row in zip(query_scores, query_rows)
+            if row >= 0 and score > threshold
+        ]
+        for query_scores, query_rows in zip(scores, rows)
+    ]
+
+def make_handler(index, nprobe=None):
+    class MatchBooksHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/health":
+                self.send_json(404, {"error": "Not found"})
+                return
+            self.send_json(200, {"status": "ok", **index.meta})
+        
+        def do_POST(self):
+            if self.path != "/match_books":
+                self.send_json(404, {"error": "Not found"})
+                return
+            
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                start = time.perf_counter()
+                matches = match_books(index, payload, nprobe)
+                elapsed = time.perf_counter() - start
+            except (ValueError, TypeError) as e:
+                self.send_json(400, {"error": str(e)})
+                return
+            except Exception as e:
+                # Never drop the connection without an answer
+                self.send_json(500, {"error": f"Internal error: {e!r}"})
+                return
+            
+            batched = "queries" in payload or "query_embeddings" in payload
+            body = {"results": matches} if batched else {"matches": matches[0]}
+            body["tookMs"] = round(elapsed * 1000, 3)
+            self.send_json(200, body)
+        
+        def send_json(self, status, body):
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        
+        def log_message(self, format, *args):
+            pass
+    
+    return MatchBooksHandler
+
+def serve(index, host="127.0.0.1", port=8765, nprobe=None):
+    """Serve the index until interrupted"""
+    
+    index.books  # Load rows before the first request
+    server = ThreadingHTTPServer((host, port), make_handler(index, nprobe))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,108 @@
+"""Book loaders: JSONL dumps and the mock data exported from lib/data/*.ts"""
+
+import re
+import json
+
+# Tokens of the object/array literal subset used by lib/data/mockBooks.ts
+TS_TOKEN = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+  | (?P<number>-?\d+(?:\.\d+)?)
+  | (?P<name>[A-Za-z_$][\w$]*)
+  | (?P<punct>[{}\[\]:,])
+""", re.S | re.X)
+
+def _ts_string(literal):
+    body = literal[1:-1].replace("\\'", "'")
+    if literal[0] == "'":
+        body = re.sub(r'(?<!\\)"', '\\"', body)
+    return json.loads(f'"{body}"')
+
+def ts_literal_to_python(source):
+    """Convert a TypeScript array/object literal to Python values
+    
+    Handles unquoted keys, single-quoted strings, comments and trailing
+    commas, which covers the mock data files; anything else (spreads,
+    function calls, template strings) raises ValueError.
+    """
+    
+    tokens = []
+    for match in TS_TOKEN.finditer(source):
+        kind = match.lastgroup
+        if kind not in ("space", "comment"):
+            tokens.append((kind, match.group()))
+    
+    if sum(len(match.group()) for match in TS_TOKEN.finditer(source)) != len(source):
+        raise ValueError("Unsupported syntax in TypeScript literal")
+    
+    out = []
+    for i, (kind, text) in enumerate(tokens):
+        following = tokens[i + 1][1] if i + 1 < len(tokens) else None
+        if kind == "string":
+            out.append(json.dumps(_ts_string(text)))
+        elif kind == "name" and following == ":":
+            out.append(json.dumps(text))
+        elif kind == "name" and text in ("true", "false", "null"):
+            out.append(text)
+        elif kind == "name":
+            raise ValueError(f"Unsupported identifier in TypeScript literal: {text}")
+        elif text == "," and following in ("}", "]"):
+            continue
+        else:
+            out.append(text)
+    
+    return json.loads("".join(out))
+
+def extract_ts_export(source, name):
+    """Source text of the array literal assigned to `export const <name>`"""
+    
+    match = re.search(rf"export\s+const\s+{re.escape(name)}\b[^=]*=\s*\[", source)
+    if not match:
+        raise ValueError(f"No exported array named {name}")
+    
+    start = match.end() - 1
+    depth = 0
+    for token in TS_TOKEN.finditer(source, start):
+        if token.lastgroup != "punct":
+            continue
+        if token.group() in "[{":
+            depth += 1
+        elif token.group() in "]}":
+            depth -= 1
+            if depth == 0:
+                return source[start:token.end()]
+    
+    raise ValueError(f"Unterminated array literal for {name}")
+
+def normalize_book(raw):
+    """Map a mock Book or a JSONL row onto the books/book_embeddings columns"""
+    
+    metadata = raw.get("metadata") or {}
+    tags = []
+    for values in (raw.get("tropes"), raw.get("tags"), metadata.get("themes"),
+                   metadata.get("tropes"), metadata.get("mood")):
+        tags.extend(values or [])
+    
+    return {
+        "id": str(raw["id"]),
+        "title": raw.get("title", ""),
+        "author": raw.get("author", ""),
+        "description": raw.get("description") or metadata.get("synopsis") or "",
+        "cover_url": raw.get("cover_url") or raw.get("cover") or "",
+        "genres": list(raw.get("genres") or []),
+        "tags": list(dict.fromkeys(tags))
+    }
+
+def load_ts_books(path, export="mockBooksWithMetadata"):
+    """Books from an exported array in a lib/data/*.ts file"""
+    
+    with open(path) as f:
+        source = f.read()
+    return [normalize_book(book) for book in ts_literal_to_python(extract_ts_export(source, export))]
+
+def load_jsonl_books(path):
+    """Books from a JSONL dump, one book object per line"""
+    
+    with open(path) as f:
+        return [normalize_book(json.loads(line)) for line in f if line.strip()]
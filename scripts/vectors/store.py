@@ -0,0 +1,214 @@
+"""Memory-mapped vector index with brute-force and IVF top-k cosine search
+
+An index is a directory:
+
+    meta.json      dimension, dtype, row count and IVF list count
+    vectors.bin    (count, dim) float32 or float16 unit vectors, np.memmap
+    books.jsonl    one book row per vector, same order
+    ivf.npz        coarse centroids and list offsets (IVF indexes only)
+
+With IVF enabled the rows are stored grouped by list, so probing a list
+reads one contiguous slice of the memory map. Vectors are unit length, so
+cosine similarity is a plain dot product.
+"""
+
+import os
+import json
+
+import numpy as np
+
+from .embedding import normalize
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+INDEX_DIR = os.path.join(REPO_ROOT, ".vector-index")
+
+INDEX_VERSION = 1
+
+# Rows scored per matrix multiply during a brute-force scan
+SCAN_CHUNK_ROWS = 1 << 15
+
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLE_PER_LIST = 64
+
+def merge_top_k(scores, rows, new_scores, new_rows, k):
+    """Keep the k best (score, row) pairs per query across two candidate sets"""
+    
+    scores = np.concatenate([scores, new_scores], axis=1)
+    rows = np.concatenate([rows, new_rows], axis=1)
+    if scores.shape[1] > k:
+        keep = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        scores = np.take_along_axis(scores, keep, axis=1)
+        rows = np.take_along_axis(rows, keep, axis=1)
+    return scores, rows
+
+def sort_top_k(scores, rows):
+    order = np.argsort(-scores, axis=1, kind="stable")
+    return np.take_along_axis(scores, order, axis=1), np.take_along_axis(rows, order, axis=1)
+
+def train_centroids(vectors, nlist, seed=0):
+    """Spherical k-means on a sample of rows; returns (nlist, dim) unit centroids"""
+    
+    rng = np.random.default_rng(seed)
+    count = len(vectors)
+    sample_size = min(count, nlist * KMEANS_SAMPLE_PER_LIST)
+    sample = np.asarray(vectors[np.sort(rng.choice(count, sample_size, replace=False))], dtype=np.float32)
+    
+    centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+    for _ in range(KMEANS_ITERATIONS):
+        labels = (sample @ centroids.T).argmax(axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, sample)
+        empty = np.bincount(labels, minlength=nlist) == 0
+        # Reseed empty lists with random sample rows
+        sums[empty] = sample[rng.choice(sample_size, int(empty.sum()))]
+        centroids = normalize(sums)
+    
+    return centroids
+
+def assign_lists(vectors, centroids):
+    """Nearest centroid per row, computed chunk by chunk over the memory map"""
+    
+    labels = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), SCAN_CHUNK_ROWS):
+        chunk = np.asarray(vectors[start:start + SCAN_CHUNK_ROWS], dtype=np.float32)
+        labels[start:start + len(chunk)] = (chunk @ centroids.T).argmax(axis=1)
+    return labels
+
+class VectorIndex:
+    """Read side of an index directory"""
+    
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as f:
+            self.meta = json.load(f)
+        
+        self.dim = self.meta["dim"]
+        self.count = self.meta["count"]
+        self.vectors = np.memmap(
+            os.path.join(path, "vectors.bin"), dtype=self.meta["dtype"], mode="r",
+            shape=(self.count, self.dim)
+        )
+        
+        self.centroids = None
+        self.offsets = None
+        if self.meta.get("nlist"):
+            ivf = np.load(os.path.join(path, "ivf.npz"))
+            self.centroids = ivf["centroids"]
+            self.offsets = ivf["offsets"]
+        
+        self._books = None
+    
+    @property
+    def books(self):
+        """Book rows, loaded on first use"""
+        
+        if self._books is None:
+            with open(os.path.join(self.path, "books.jsonl")) as f:
+                self._books = [json.loads(line) for line in f]
+        return self._books
+    
+    def search(self, queries, k=10, nprobe=None):
+        """Top-k cosine search for a batch of query vectors
+        
+        Brute force scans every row; with nprobe on an IVF index only the
+        nprobe nearest lists per query are scored. Returns (scores, rows),
+        both (queries, k) and sorted best first; rows are -1 where fewer
+        than k candidates exist.
+        """
+        
+        queries = normalize(np.atleast_2d(np.asarray(queries, dtype=np.float32)))
+        k = min(k, self.count)
+        
+        if nprobe and self.centroids is not None:
+            scores, rows = self._search_ivf(queries, k, nprobe)
+        else:
+            scores, rows = self._search_brute(queries, k)
+        
+        return sort_top_k(scores, rows)
+    
+    def _search_brute(self, queries, k):
+        scores = np.empty((len(queries), 0), dtype=np.float32)
+        rows = np.empty((len(queries), 0), dtype=np.int64)
+        
+        for start in range(0, self.count, SCAN_CHUNK_ROWS):
+            chunk = np.asarray(self.vectors[start:start + SCAN_CHUNK_ROWS], dtype=np.float32)
+            chunk_scores = queries @ chunk.T
+            chunk_k = min(k, len(chunk))
+            top = np.argpartition(-chunk_scores, chunk_k - 1, axis=1)[:, :chunk_k]
+            scores, rows = merge_top_k(
+                scores, rows,
+                np.take_along_axis(chunk_scores, top, axis=1), top + start,
+                k
+            )
+        
+        return scores, rows
+    
+    def _search_ivf(self, queries, k, nprobe):
+        nprobe = min(nprobe, len(self.centroids))
+        probes = np.argpartition(-(queries @ self.centroids.T), nprobe - 1, axis=1)[:, :nprobe]
+        
+        scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        rows = np.full((len(queries), k), -1, dtype=np.int64)
+        
+        # Score each probed list once against every query that probes it
+        for list_id in np.unique(probes):
+            start, end = self.offsets[list_id], self.offsets[list_id + 1]
+            if start == end:
+                continue
+            members = np.nonzero((probes == list_id).any(axis=1))[0]
+            chunk = np.asarray(self.vectors[start:end], dtype=np.float32)
+            chunk_scores = queries[members] @ chunk.T
+            chunk_k = min(k, end - start)
+            top = np.argpartition(-chunk_scores, chunk_k - 1, axis=1)[:, :chunk_k]
+            scores[members], rows[members] = merge_top_k(
+                scores[members], rows[members],
+                np.take_along_axis(chunk_scores, top, axis=1), top + start,
+                k
+            )
+        
+        return scores, rows
+
+def build_index(path, vectors, books, dtype="float32", nlist=0):
+    """Write an index directory from (count, dim) vectors and matching book rows
+    
+    vectors may itself be a memory map; it is read in chunks. When nlist > 0
+    an IVF partition is trained and rows are written grouped by list.
+    """
+    
+    count, dim = vectors.shape
+    os.makedirs(path, exist_ok=True)
+    
+    nlist = min(nlist, count)
+    order = np.arange(count)
+    ivf = None
+    if nlist:
+        centroids = train_centroids(vectors, nlist)
+        labels = assign_lists(vectors, centroids)
+        order = np.argsort(labels, kind="stable")
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(labels, minlength=nlist))]).astype(np.int64)
+        ivf = {"centroids": centroids, "offsets": offsets}
+    
+    out = np.memmap(os.path.join(path, "vectors.bin"), dtype=dtype, mode="w+", shape=(count, dim))
+    for start in range(0, count, SCAN_CHUNK_ROWS):
+        rows = order[start:start + SCAN_CHUNK_ROWS]
+        # Gather in ascending row order so the source is read sequentially
+        gather = np.argsort(rows, kind="stable")
+        chunk = normalize(np.asarray(vectors[rows[gather]], dtype=np.float32))
+        out[start + gather] = chunk
+    out.flush()
+    del out
+    
+    with open(os.path.join(path, "books.jsonl"), "w") as f:
+        for row in order:
+            f.write(json.dumps(books[row]) + "\n")
+    
+    if ivf:
+        np.savez(os.path.join(path, "ivf.npz"), **ivf)
+    elif os.path.exists(os.path.join(path, "ivf.npz")):
+        os.remove(os.path.join(path, "ivf.npz"))
+    
+    with open(os.path.join(path, "meta.json"), "w") as f:
+        json.dump({"version": INDEX_VERSION, "dim": dim, "dtype": dtype, "count": count, "nlist": nlist}, f, indent=2)
+        f.write("\n")
+    
+    return VectorIndex(path)
@@ -0,0 +1,37 @@
+"""Fixtures for the vector index tests
+
+Run from the repository root with:
+    
+    python -m pytest scripts/vectors/tests -q
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Make `scripts.vectors` importable however pytest was started
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from scripts.vectors.cli import synthetic_catalog  # noqa: E402
+from scripts.vectors.embedding import normalize  # noqa: E402
+
+CATALOG_ROWS = 3000
+CATALOG_DIM = 32
+
+@pytest.fixture(scope="session")
+def catalog(tmp_path_factory):
+    """Clustered float32 source vectors as a memory map, plus their book rows"""
+    
+    path = tmp_path_factory.mktemp("catalog") / "source.f32"
+    vectors = synthetic_catalog(str(path), CATALOG_ROWS, CATALOG_DIM, clusters=20)
+    books = [{"id": str(row), "title": f"Book {row}", "author": "Author"} for row in range(CATALOG_ROWS)]
+    return vectors, books
+
+@pytest.fixture(scope="session")
+def queries():
+    rng = np.random.default_rng(7)
+    return normalize(rng.standard_normal((16, CATALOG_DIM), dtype=np.float32))
@@ -0,0 +1,84 @@
+"""match_books validation and the HTTP status codes the service answers with"""
+
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from scripts.vectors.server import MAX_MATCH_COUNT, make_handler, match_books
+from scripts.vectors.store import build_index
+
+@pytest.fixture(scope="module")
+def index(catalog, tmp_path_factory):
+    vectors, books = catalog
+    return build_index(str(tmp_path_factory.mktemp("index")), vectors, books)
+
+@pytest.fixture(scope="module")
+def base_url(index):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(index))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+def post(base_url, body):
+    """(status, JSON reply) for a raw request body"""
+    
+    request = urllib.request.Request(f"{base_url}/match_books", data=body, method="POST")
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as e:
+        return e.code, json.load(e)
+
+BAD_PAYLOADS = [
+    b"not json",
+    b"[1, 2]",
+    b"{}",
+    b'{"query": 5}',
+    b'{"queries": "one"}',
+    b'{"queries": ["one", 2]}',
+    b'{"queries": []}',
+    b'{"query_embedding": [1, 2]}',
+    b'{"query_embedding": ["a"]}',
+    b'{"query_embeddings": [[1, 2], "x"]}',
+    b'{"query": "x", "match_count": "10"}',
+    b'{"query": "x", "match_count": 0}',
+    b'{"query": "x", "match_count": true}',
+    b'{"query": "x", "match_threshold": "high"}',
+    b'{"query": "x", "nprobe": 1.5}'
+]
+
+@pytest.mark.parametrize("body", BAD_PAYLOADS)
+def test_bad_payload_returns_400(base_url, body):
+    status, reply = post(base_url, body)
+    assert status == 400
+    assert reply["error"]
+
+def test_query_returns_matches(base_url, index):
+    status, reply = post(base_url, json.dumps({"query_embedding": index.vectors[5].tolist(), "match_count": 3}).encode())
+    assert status == 200
+    assert reply["matches"][0]["id"] == index.books[5]["id"]
+    assert len(reply["matches"]) == 3
+
+def test_batched_queries_return_results(base_url):
+    status, reply = post(base_url, json.dumps({"queries": ["book one", "book two"]}).encode())
+    assert status == 200
+    assert len(reply["results"]) == 2
+
+def test_unexpected_error_returns_500(index, base_url, monkeypatch):
+    def broken_search(*args, **kwargs):
+        raise RuntimeError("disk went away")
+    
+    monkeypatch.setattr(index, "search", broken_search)
+    status, reply = post(base_url, json.dumps({"query": "x"}).encode())
+    assert status == 500
+    assert "disk went away" in reply["error"]
+
+def test_match_books_clamps_count(index):
+    matches = match_books(index, {"query_embedding": index.vectors[0].tolist(), "match_count": 10_000, "match_threshold": -1})
+    assert len(matches[0]) == MAX_MATCH_COUNT < index.count
@@ -0,0 +1,74 @@
+"""Search results of the memory-mapped index against exact answers"""
+
+import numpy as np
+import pytest
+
+from scripts.vectors import store
+from scripts.vectors.embedding import normalize
+from scripts.vectors.store import build_index, merge_top_k
+
+K = 10
+
+def exact_top_k(vectors, queries, k=K):
+    """Row ids and scores of the k best rows per query by a full argsort"""
+    
+    scores = queries @ normalize(np.asarray(vectors, dtype=np.float32)).T
+    rows = np.argsort(-scores, axis=1, kind="stable")[:, :k]
+    return np.take_along_axis(scores, rows, axis=1), rows
+
+def book_rows(index, rows):
+    """Map stored rows (IVF indexes reorder them) back to source row ids"""
+    
+    return np.array([[int(index.books[row]["id"]) for row in query_rows] for query_rows in rows])
+
+def test_merge_top_k_keeps_best():
+    scores, rows = merge_top_k(
+        np.array([[0.9, 0.1]]), np.array([[0, 1]]),
+        np.array([[0.5, 0.95]]), np.array([[2, 3]]),
+        2
+    )
+    assert sorted(rows[0].tolist()) == [0, 3]
+    assert sorted(scores[0].tolist()) == [0.9, 0.95]
+
+def test_brute_force_matches_argsort(catalog, queries, tmp_path, monkeypatch):
+    vectors, books = catalog
+    # Several scan chunks, the last one partial, so merging is exercised
+    monkeypatch.setattr(store, "SCAN_CHUNK_ROWS", 700)
+    index = build_index(str(tmp_path / "index"), vectors, books)
+    
+    scores, rows = index.search(queries, K)
+    expected_scores, expected_rows = exact_top_k(vectors, queries)
+    
+    assert np.array_equal(book_rows(index, rows), expected_rows)
+    assert np.allclose(scores, expected_scores, atol=1e-5)
+
+def test_ivf_full_probe_matches_brute_force(catalog, queries, tmp_path):
+    vectors, books = catalog
+    nlist = 16
+    index = build_index(str(tmp_path / "index"), vectors, books, nlist=nlist)
+    
+    brute_scores, brute_rows = index.search(queries, K)
+    ivf_scores, ivf_rows = index.search(queries, K, nprobe=nlist)
+    
+    assert np.array_equal(ivf_rows, brute_rows)
+    assert np.allclose(ivf_scores, brute_scores)
+    assert np.array_equal(book_rows(index, ivf_rows), exact_top_k(vectors, queries)[1])
+
+def test_ivf_rows_keep_their_books(catalog, tmp_path):
+    vectors, books = catalog
+    index = build_index(str(tmp_path / "index"), vectors, books, nlist=16)
+    
+    source_rows = [int(book["id"]) for book in index.books]
+    assert sorted(source_rows) == list(range(len(books)))
+    assert np.allclose(index.vectors, normalize(np.asarray(vectors[source_rows], dtype=np.float32)), atol=1e-6)
+    assert index.offsets[0] == 0 and index.offsets[-1] == len(books)
+
+@pytest.mark.parametrize("nlist", [0, 16])
+def test_float16_index_finds_exact_neighbours(catalog, tmp_path, nlist):
+    vectors, books = catalog
+    index = build_index(str(tmp_path / "index"), vectors, books, dtype="float16", nlist=nlist)
+    
+    # Each stored book is its own nearest neighbour, whatever the precision
+    picks = np.arange(0, len(books), 250)
+    _, rows = index.search(np.asarray(vectors[picks]), 1, nprobe=nlist or None)
+    assert book_rows(index, rows)[:, 0].tolist() == picks.tolist()